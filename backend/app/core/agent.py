@@ -6,11 +6,21 @@ Plan → Execute → Synthesize workflow for geotechnical AI assistant
 """
 
 import asyncio
-import json
-import uuid
+import hashlib
+import itertools
+import re
+import string
+import sys
 import logging
 import time
-from typing import Dict, Any, Optional
+from datetime import datetime, timezone
+from functools import lru_cache
+from secrets import token_hex
+from typing import Dict, Any, List, Literal, Optional
+
+import httpx
+import orjson
+from pydantic import BaseModel, ValidationError
 
 from app.core.config.settings import get_settings
 from app.core.config.config_loader import (
@@ -18,7 +28,12 @@ from app.core.config.config_loader import (
     get_planning_prompt, 
     get_synthesis_prompt
 )
-from app.core.config.logging_config import get_trace_logger
+from app.core.config.logging_config import (
+    get_trace_logger,
+    reset_trace_id,
+    set_trace_id,
+    TraceAdapter
+)
 from app.core.llms.openai import OpenAIService
 from app.services.agentic_workflow.tools.geotech_calculators import call_tool
 from app.services.agentic_workflow.retrieval.rag_service import RAGService
@@ -27,25 +42,114 @@ from app.services.observability import (
     get_metrics_collector, 
     time_request
 )
-from app.api.schema.response import AskResponse
+from app.api.schema.response import AskResponse, Citation
+from app.core.cache.answer_cache import AnswerCache
+from app.core.config.constants import CacheConstants
 
 logger = logging.getLogger(__name__)
 
+# Matches a plan wrapped in a markdown code fence (```json ... ``` or ``` ... ```)
+_CODE_FENCE_RE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+# Outermost JSON object in a reply that wraps the plan in commentary
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+# Questions carrying numeric inputs are usually calculations, which never use the speculative search
+_NUMERIC_INPUT_RE = re.compile(r"\d")
+# Renders one citation for the synthesis prompt's retrieved_info block
+_format_citation = "Source: {0.source_name}\n{0.content}".format
+
+
+def _normalize_query(text: str) -> str:
+    """Case- and whitespace-insensitive form of a search query"""
+    return " ".join(text.lower().split())
+
+
+class PlanModel(BaseModel):
+    """Execution plan returned by the planning LLM call"""
+    action: Literal["retrieve", "calculate_settlement", "calculate_bearing_capacity", "both", "out_of_scope"]
+    reasoning: str
+    search_query: Optional[str] = None
+    tool_parameters: Optional[Dict[str, Any]] = None
+
+
+class PromptTemplate:
+    """
+    str.format-style prompt template parsed once into literal text and field names,
+    so rendering is a single join instead of re-parsing the template per request
+    """
+    
+    def __init__(self, template: str):
+        self._parts = []
+        for literal, field, format_spec, conversion in string.Formatter().parse(template):
+            if format_spec or conversion:
+                raise ValueError(f"Prompt field '{field}' uses a format spec or conversion, which is not supported")
+            self._parts.append((literal, field))
+        self.fields = frozenset(field for _, field in self._parts if field is not None)
+    
+    def render(self, **values: Any) -> str:
+        """Equivalent to template.format(**values)"""
+        return "".join([
+            literal if field is None else literal + str(values[field])
+            for literal, field in self._parts
+        ])
+
+
+def _parse_plan(content: str) -> Dict[str, Any]:
+    """Validate the planning LLM reply, unwrapping code fences and surrounding prose"""
+    content = content.strip()
+    fence_match = _CODE_FENCE_RE.match(content)
+    if fence_match:
+        content = fence_match.group(1)
+    
+    try:
+        plan = PlanModel.model_validate_json(content)
+    except ValidationError:
+        object_match = _JSON_OBJECT_RE.search(content)
+        if object_match is None or object_match.group(0) == content:
+            raise
+        plan = PlanModel.model_validate_json(object_match.group(0))
+    return plan.model_dump(exclude_none=True)
+
+OUT_OF_SCOPE_ANSWER = (
+    "I apologize, but this question is outside my knowledge base scope, which covers Settle3, "
+    "CPT analysis, Liquefaction, and basic geotechnical calculations. "
+    "Please ask me questions related to these topics."
+)
+
 class GeotechAgent:
     """
     Main Agent for geotechnical engineering questions
     Orchestrates Plan → Execute → Synthesize workflow
     """
     
-    def __init__(self):
+    # Plan actions that consult the knowledge base
+    RETRIEVAL_ACTIONS = frozenset({"retrieve", "both"})
+    
+    # Calculation action -> (tool name, description, required parameters, parameters identifying the tool)
+    CALCULATION_TOOLS = {
+        "calculate_settlement": (
+            "settlement_calculator", "settlement",
+            frozenset({"load", "young_modulus"}), frozenset({"load", "young_modulus"})
+        ),
+        "calculate_bearing_capacity": (
+            "bearing_capacity_calculator", "bearing capacity",
+            frozenset({"B", "gamma", "Df", "phi"}), frozenset({"B", "gamma"})
+        ),
+    }
+    
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
         self.settings = get_settings()
+        # Retrieval parameters are read on every search; snapshot them as plain attributes
+        self._top_k = int(self.settings.TOP_K_RETRIEVAL)
+        self._similarity_threshold = float(self.settings.SIMILARITY_THRESHOLD)
         
+        # Without an injected client the LLM service uses the process-wide connection pool
         self.llm_service = OpenAIService(
             api_key=self.settings.OPENAI_API_KEY,
             model=self.settings.OPENAI_MODEL,
             timeout=self.settings.LLM_TIMEOUT,
             max_retries=self.settings.LLM_MAX_RETRIES,
-            max_completion_tokens=self.settings.LLM_MAX_COMPLETION_TOKENS
+            max_completion_tokens=self.settings.LLM_MAX_COMPLETION_TOKENS,
+            http_client=http_client
         )
         
         self.rag_service = RAGService(
@@ -54,34 +158,81 @@ class GeotechAgent:
             settings=self.settings
         )
         
-        self.system_prompt = get_system_prompt()
-        self.planning_prompt = get_planning_prompt()
-        self.synthesis_prompt = get_synthesis_prompt()
+        # Bursts of requests queue here instead of all hitting the LLM API (and its rate limits) at once
+        self._llm_semaphore = asyncio.Semaphore(self.settings.LLM_MAX_CONCURRENCY)
+        
+        # Prompts are immutable after load; interning lets every agent share one copy
+        self.system_prompt = sys.intern(get_system_prompt().strip())
+        self.planning_prompt = sys.intern(get_planning_prompt().strip())
+        self.synthesis_prompt = sys.intern(get_synthesis_prompt().strip())
+        self._planning_template = PromptTemplate(self.planning_prompt)
+        self._synthesis_template = PromptTemplate(self.synthesis_prompt)
+        # Shared across requests - treat as read-only
+        self._system_message = {"role": "system", "content": self.system_prompt}
         
-        self.total_requests = 0
-        self.tool_calls = 0
-        self.retrieval_calls = 0
+        # Plan action -> execution handler
+        self._action_handlers = {
+            "retrieve": self._handle_retrieve,
+            "calculate_settlement": self._handle_calculation,
+            "calculate_bearing_capacity": self._handle_calculation,
+            "both": self._handle_both,
+            "out_of_scope": self._handle_out_of_scope
+        }
+        
+        # Usage counters are shared by concurrent requests; next() on itertools.count is
+        # atomic, so each update is one C call instead of a read-modify-write on the attribute
+        self._reset_counters()
+        
+        # Repeated questions (FAQs, out-of-scope chatter) skip the LLM round trips
+        self.answer_cache = AnswerCache()
+        # Cached answers are only valid for the model and prompts that produced them
+        self._cache_namespace = hashlib.sha256("\x00".join((
+            self.settings.OPENAI_MODEL, self.system_prompt, self.planning_prompt, self.synthesis_prompt
+        )).encode("utf-8")).hexdigest()
+        # ...and for the indexed knowledge base; the Qdrant point count changes whenever
+        # the setup script re-ingests, so a new count invalidates the cache
+        self._index_version: Optional[int] = None
+        self._index_checked_at = float("-inf")
+        
+        # Tracing is configured once at startup; keep the client only when it can record
+        langfuse_client = get_langfuse_client()
+        self._langfuse_client = langfuse_client if langfuse_client.enabled else None
+        
+        # Resolve the global metrics collector once instead of per tool/retrieval call
+        self.metrics_collector = get_metrics_collector()
+        self._increment_tool_calls = self.metrics_collector.increment_tool_calls
+        self._increment_retrieval_calls = self.metrics_collector.increment_retrieval_calls
     
-    async def plan(self, question: str, trace_id: Optional[str] = None) -> Dict[str, Any]:
+    def _build_messages(self, user_message: str) -> List[Dict[str, str]]:
+        """Build conversation messages reusing the precomputed system message"""
+        return [self._system_message, {"role": "user", "content": user_message}]
+    
+    async def _call_llm(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Call the LLM, waiting for a free slot when LLM_MAX_CONCURRENCY calls are in flight"""
+        async with self._llm_semaphore:
+            return await self.llm_service.call_llm(messages)
+    
+    async def plan(
+        self,
+        question: str,
+        trace_id: Optional[str] = None,
+        trace_logger: Optional[TraceAdapter] = None
+    ) -> Dict[str, Any]:
         """Step 1: Analyze question and create execution plan (ASYNC)"""
-        logger.info(f"[{trace_id}] ENTERING agent.plan")
-        start_time = time.time()
-        trace_logger = get_trace_logger(trace_id or "test-trace")
+        logger.debug("[%s] ENTERING agent.plan", trace_id)
+        start_ns = time.perf_counter_ns()
+        trace_logger = trace_logger or get_trace_logger()
         
         try:
-            formatted_prompt = self.planning_prompt.format(question=question)
-            messages = self.llm_service.create_conversation(system_prompt=self.system_prompt, user_message=formatted_prompt)
+            formatted_prompt = self._planning_template.render(question=question)
+            messages = self._build_messages(formatted_prompt)
             
-            response = await self.llm_service.call_llm(messages)
+            response = await self._call_llm(messages)
             
             if response["status"] != "success":
                 raise Exception(f"LLM planning failed: {response.get('error', 'Unknown error')}")
             
-            content = response.get("content", "").strip()
-            if content.startswith("```json"):
-                content = content.strip("```json").strip("```").strip()
-            
-            plan = json.loads(content)
+            plan = _parse_plan(response.get("content", ""))
             
             # DEBUG: Print the plan
             print(f"\n=== PLANNING DEBUG ===", flush=True)
@@ -90,22 +241,29 @@ class GeotechAgent:
             print(f"Full plan: {plan}", flush=True)
             print(f"=== END PLANNING DEBUG ===\n", flush=True)
             
-            duration_ms = (time.time() - start_time) * 1000
-            trace_logger.log_agent_step("planning", f"Agent plan created: {plan['action']}", duration_ms=duration_ms)
-            logger.info(f"[{trace_id}] EXITING agent.plan")
+            duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+            trace_logger.log_agent_step("planning", "Agent plan created: %s", plan['action'], duration_ms=duration_ms)
+            logger.debug("[%s] EXITING agent.plan", trace_id)
             return plan
             
         except Exception as e:
-            logger.error(f"[{trace_id}] Planning failed: {e}", exc_info=True)
+            logger.error("[%s] Planning failed: %s", trace_id, e, exc_info=True)
             raise
 
     # FIXED: Refactored execute to be fully non-blocking
-    async def execute(self, plan: Dict[str, Any], question: str, trace_id: Optional[str] = None) -> Dict[str, Any]:
+    async def execute(
+        self,
+        plan: Dict[str, Any],
+        question: str,
+        trace_id: Optional[str] = None,
+        trace_logger: Optional[TraceAdapter] = None,
+        prefetched_citations: Optional[List[Citation]] = None
+    ) -> Dict[str, Any]:
         """Step 2: Execute the planned actions (FULLY ASYNC)"""
-        logger.info(f"[{trace_id}] ENTERING agent.execute for action: {plan['action']}")
-        start_time = time.time()
-        trace_logger = get_trace_logger(trace_id or "test-trace")
-        trace_logger.log_agent_step("execution", f"Starting execution for action: {plan['action']}")
+        logger.debug("[%s] ENTERING agent.execute for action: %s", trace_id, plan['action'])
+        start_ns = time.perf_counter_ns()
+        trace_logger = trace_logger or get_trace_logger()
+        trace_logger.log_agent_step("execution", "Starting execution for action: %s", plan['action'])
         
         action = plan["action"]
         results = {"action_taken": action, "citations": []}
@@ -116,61 +274,92 @@ class GeotechAgent:
         print(f"=== END EXECUTE DEBUG ===\n", flush=True)
 
         try:
-            if action == "retrieve":
-                print(f"Going to _execute_retrieval...", flush=True)
-                results.update(await self._execute_retrieval(plan, question, trace_id))
-            
-            elif action in ["calculate_settlement", "calculate_bearing_capacity"]:
-                print(f"Going to _execute_calculation...", flush=True)
-                # Run synchronous tool calls in a separate thread
-                calc_results = await asyncio.to_thread(self._execute_calculation, plan)
-                results.update(calc_results)
-
-            elif action == "both":
-                print(f"Going to execute both retrieval and calculation...", flush=True)
-                # Run retrieval and calculation concurrently
-                retrieval_task = self._execute_retrieval(plan, question, trace_id)
-                calc_task = asyncio.to_thread(self._execute_calculation, plan)
-                
-                retrieval_results, calc_results = await asyncio.gather(retrieval_task, calc_task)
-                
-                results.update(retrieval_results)
-                results.update(calc_results)
-
-            elif action == "out_of_scope":
-                print(f"Action is out_of_scope", flush=True)
-                results["out_of_scope"] = True
-                results["scope_message"] = "This question is outside our knowledge base scope."
-
-            else:
+            handler = self._action_handlers.get(action)
+            if handler is None:
                 print(f"Unknown action: {action}", flush=True)
                 raise Exception(f"Unknown action: {action}")
+            
+            results.update(await handler(plan, question, trace_id, prefetched_citations))
 
-            duration_ms = (time.time() - start_time) * 1000
-            trace_logger.log_agent_step("execution", f"Execution completed for action: {action}", duration_ms=duration_ms)
-            logger.info(f"[{trace_id}] EXITING agent.execute")
+            duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+            trace_logger.log_agent_step("execution", "Execution completed for action: %s", action, duration_ms=duration_ms)
+            logger.debug("[%s] EXITING agent.execute", trace_id)
             return results
 
         except Exception as e:
-            logger.error(f"[{trace_id}] Execution failed for action {action}: {e}", exc_info=True)
+            logger.error("[%s] Execution failed for action %s: %s", trace_id, action, e, exc_info=True)
             results["execution_error"] = str(e)
             return results
 
-    async def _execute_retrieval(self, plan: Dict[str, Any], question: str, trace_id: str) -> Dict[str, Any]:
-        """Execute retrieval action"""
-        logger.info(f"[{trace_id}] ENTERING _execute_retrieval")
-        self.retrieval_calls += 1
-        get_metrics_collector().increment_retrieval_calls()
+    async def _handle_retrieve(
+        self,
+        plan: Dict[str, Any],
+        question: str,
+        trace_id: Optional[str],
+        prefetched_citations: Optional[List[Citation]] = None
+    ) -> Dict[str, Any]:
+        """Action handler: knowledge base retrieval only"""
+        return await self._execute_retrieval(plan, question, trace_id, prefetched_citations)
+    
+    async def _handle_calculation(
+        self,
+        plan: Dict[str, Any],
+        question: str,
+        trace_id: Optional[str],
+        prefetched_citations: Optional[List[Citation]] = None
+    ) -> Dict[str, Any]:
+        """Action handler: calculation only"""
+        # The calculators are pure arithmetic, so they run inline; a worker thread would
+        # cost more than the calculation. Move this back to asyncio.to_thread if a tool
+        # ever does blocking I/O.
+        return self._execute_calculation(plan)
+    
+    async def _handle_both(
+        self,
+        plan: Dict[str, Any],
+        question: str,
+        trace_id: Optional[str],
+        prefetched_citations: Optional[List[Citation]] = None
+    ) -> Dict[str, Any]:
+        """Action handler: calculation inline, then retrieval (the only awaiting step)"""
+        calc_results = self._execute_calculation(plan)
+        retrieval_results = await self._handle_retrieve(plan, question, trace_id, prefetched_citations)
+        return {**retrieval_results, **calc_results}
+    
+    async def _handle_out_of_scope(
+        self,
+        plan: Dict[str, Any],
+        question: str,
+        trace_id: Optional[str],
+        prefetched_citations: Optional[List[Citation]] = None
+    ) -> Dict[str, Any]:
+        """Action handler: question is outside the knowledge base scope"""
+        return {
+            "out_of_scope": True,
+            "scope_message": "This question is outside our knowledge base scope."
+        }
+
+    async def _execute_retrieval(
+        self,
+        plan: Dict[str, Any],
+        question: str,
+        trace_id: str,
+        prefetched_citations: Optional[List[Citation]] = None
+    ) -> Dict[str, Any]:
+        """Execute retrieval action, reusing speculatively prefetched citations when available"""
+        logger.debug("[%s] ENTERING _execute_retrieval", trace_id)
+        self._retrieval_calls = next(self._retrieval_counter)
+        self._increment_retrieval_calls()
         search_query = plan.get("search_query", question)
         
         try:
-            logger.info(f"[{trace_id}] AWAITING RAG service search...")
-            citations = await self.rag_service.search(
-                query=search_query,
-                k=self.settings.TOP_K_RETRIEVAL,
-                score_threshold=self.settings.SIMILARITY_THRESHOLD
-            )
-            logger.info(f"[{trace_id}] RAG service search COMPLETED. Found {len(citations)} citations.")
+            if prefetched_citations is not None:
+                logger.debug("[%s] Using speculatively prefetched citations", trace_id)
+                citations = prefetched_citations
+            else:
+                logger.debug("[%s] AWAITING RAG service search...", trace_id)
+                citations = await self._search_knowledge_base(search_query)
+            logger.debug("[%s] RAG service search COMPLETED. Found %s citations.", trace_id, len(citations))
             
             # DETAILED DEBUG: Check what we get from RAG service
             print(f"\n=== _execute_retrieval DEBUG ===", flush=True)
@@ -183,8 +372,7 @@ class GeotechAgent:
                 print("Citations list is empty!", flush=True)
             print(f"=== END _execute_retrieval DEBUG ===\n", flush=True)
             
-            retrieved_texts = [f"Source: {c.source_name}\n{c.content}" for c in citations]
-            retrieved_info = "\n\n---\n\n".join(retrieved_texts) if retrieved_texts else "No information retrieved."
+            retrieved_info = "\n\n---\n\n".join(map(_format_citation, citations)) or "No information retrieved."
             
             result = {"retrieved_info": retrieved_info, "citations": citations}
             print(f"\n=== RETURN VALUE DEBUG ===", flush=True)
@@ -192,90 +380,143 @@ class GeotechAgent:
             print(f"Returning citations count: {len(result['citations'])}", flush=True)
             print(f"=== END RETURN VALUE DEBUG ===\n", flush=True)
             
-            logger.info(f"[{trace_id}] EXITING _execute_retrieval")
+            logger.debug("[%s] EXITING _execute_retrieval", trace_id)
             return result
             
         except Exception as e:
-            logger.error(f"[{trace_id}] Retrieval execution failed: {e}", exc_info=True)
+            logger.error("[%s] Retrieval execution failed: %s", trace_id, e, exc_info=True)
             print(f"\n=== EXCEPTION IN _execute_retrieval ===", flush=True)
             print(f"Exception: {e}", flush=True)
             print(f"=== END EXCEPTION DEBUG ===\n", flush=True)
             return {"retrieved_info": f"Retrieval error: {str(e)}", "citations": []}
     
+    async def _search_knowledge_base(self, query: str) -> List[Citation]:
+        """Run a RAG search with the configured retrieval parameters"""
+        return await self.rag_service.search(
+            query=query,
+            k=self._top_k,
+            score_threshold=self._similarity_threshold
+        )
+    
+    async def _check_index_version(self) -> None:
+        """
+        Clear the answer cache when the knowledge base was re-indexed since the last
+        check. Polls the collection at most every INDEX_VERSION_CHECK_SECONDS.
+        """
+        now = time.monotonic()
+        if now - self._index_checked_at < CacheConstants.INDEX_VERSION_CHECK_SECONDS:
+            return
+        self._index_checked_at = now
+        
+        try:
+            index_version = await asyncio.to_thread(self.rag_service.vector_store.points_count)
+        except Exception as e:
+            logger.warning("Could not read the knowledge base index version, answer cache not revalidated: %s", e)
+            return
+        if index_version == self._index_version:
+            return
+        if self._index_version is not None:
+            logger.info("Knowledge base index changed (%s -> %s points)", self._index_version, index_version)
+            self.answer_cache.clear()
+        self._index_version = index_version
+    
+    async def _embed_question(self, question: str) -> Optional[List[float]]:
+        """Embed the question for the semantic answer cache. Returns None if disabled or on failure."""
+        if not CacheConstants.SEMANTIC_CACHE_ENABLED:
+            return None
+        try:
+            return await self.rag_service.embedding_service.get_query_embedding_async(question)
+        except Exception as e:
+            logger.warning("Question embedding failed, skipping semantic cache: %s", e)
+            return None
+    
+    async def _resolve_prefetched_citations(
+        self,
+        prefetch_task: Optional["asyncio.Task[List[Citation]]"],
+        plan: Dict[str, Any],
+        question: str
+    ) -> Optional[List[Citation]]:
+        """
+        Reuse the speculative retrieval if the plan searches for the original question
+        (ignoring case and whitespace), otherwise cancel it. Returns None when the caller
+        should search itself.
+        """
+        if prefetch_task is None:
+            return None
+        
+        search_query = plan.get("search_query") or question
+        if (plan.get("action") in self.RETRIEVAL_ACTIONS
+                and _normalize_query(search_query) == _normalize_query(question)):
+            try:
+                return await prefetch_task
+            except Exception as e:
+                logger.warning("Speculative retrieval failed, searching again: %s", e)
+                return None
+        
+        prefetch_task.cancel()
+        return None
+    
     def _execute_calculation(self, plan: Dict[str, Any]) -> Dict[str, Any]:
         """Synchronous wrapper for all calculation tools."""
-        tool_params = plan.get("tool_parameters", {})
-        action = plan.get("action")
+        tool_params = plan.get("tool_parameters") or {}
+        provided = frozenset(k for k, v in tool_params.items() if v is not None)
 
         # Prioritize action field over parameter detection
-        if action == "calculate_settlement":
-            self.tool_calls += 1
-            get_metrics_collector().increment_tool_calls()
-            required = ["load", "young_modulus"]
-            if not all(k in tool_params and tool_params[k] is not None for k in required):
-                raise ValueError("Missing or invalid parameters for settlement calculation.")
-            params = {k: tool_params[k] for k in required}
-            return {"calculation_results": call_tool("settlement_calculator", **params)}
-
-        elif action == "calculate_bearing_capacity":
-            self.tool_calls += 1
-            get_metrics_collector().increment_tool_calls()
-            required = ["B", "gamma", "Df", "phi"]
-            if not all(k in tool_params and tool_params[k] is not None for k in required):
-                raise ValueError("Missing or invalid parameters for bearing capacity calculation.")
-            params = {k: tool_params[k] for k in required}
-            return {"calculation_results": call_tool("bearing_capacity_calculator", **params)}
-
-        # Fallback to parameter detection only if action is unclear
-        elif ("load" in tool_params and "young_modulus" in tool_params and 
-              tool_params["load"] is not None and tool_params["young_modulus"] is not None):
-            self.tool_calls += 1
-            get_metrics_collector().increment_tool_calls()
-            required = ["load", "young_modulus"]
-            params = {k: tool_params[k] for k in required}
-            return {"calculation_results": call_tool("settlement_calculator", **params)}
-
-        elif ("B" in tool_params and "gamma" in tool_params and 
-              tool_params["B"] is not None and tool_params["gamma"] is not None):
-            self.tool_calls += 1
-            get_metrics_collector().increment_tool_calls()
-            required = ["B", "gamma", "Df", "phi"]
-            if not all(k in tool_params and tool_params[k] is not None for k in required):
-                raise ValueError("Missing or invalid parameters for bearing capacity calculation.")
-            params = {k: tool_params[k] for k in required}
-            return {"calculation_results": call_tool("bearing_capacity_calculator", **params)}
-        
-        else:
-            logger.warning(f"Could not determine calculation type for plan: {plan}")
+        tool = self.CALCULATION_TOOLS.get(plan.get("action"))
+        if tool is None:
+            # Fallback to parameter detection only if action is unclear
+            tool = next(
+                (spec for spec in self.CALCULATION_TOOLS.values() if spec[3] <= provided),
+                None
+            )
+        if tool is None:
+            logger.warning("Could not determine calculation type for plan: %s", plan)
             return {"calculation_results": "No specific calculation could be performed."}
 
-    async def synthesize(self, question: str, execution_results: Dict[str, Any], trace_id: Optional[str] = None) -> str:
+        tool_name, description, required, _ = tool
+        self._tool_calls = next(self._tool_counter)
+        self._increment_tool_calls()
+        if not required <= provided:
+            raise ValueError(f"Missing or invalid parameters for {description} calculation.")
+        params = {k: tool_params[k] for k in required}
+        return {"calculation_results": call_tool(tool_name, **params)}
+
+    async def synthesize(
+        self,
+        question: str,
+        execution_results: Dict[str, Any],
+        trace_id: Optional[str] = None,
+        trace_logger: Optional[TraceAdapter] = None
+    ) -> str:
         """Step 3: Synthesize final answer from execution results (ASYNC)"""
-        logger.info(f"[{trace_id}] ENTERING agent.synthesize")
-        start_time = time.time()
-        trace_logger = get_trace_logger(trace_id or "test-trace")
+        logger.debug("[%s] ENTERING agent.synthesize", trace_id)
+        start_ns = time.perf_counter_ns()
+        trace_logger = trace_logger or get_trace_logger()
         trace_logger.log_agent_step("synthesis", "Starting answer synthesis")
         
         try:
             if execution_results.get("out_of_scope"):
-                return "I apologize, but this question is outside my knowledge base scope, which covers Settle3, CPT analysis, Liquefaction, and basic geotechnical calculations. Please ask me questions related to these topics."
+                return OUT_OF_SCOPE_ANSWER
             
             retrieved_info = execution_results.get("retrieved_info", "No information retrieved.")
             calculation_results = execution_results.get("calculation_results", "No calculations performed.")
             
-            formatted_prompt = self.synthesis_prompt.format(
+            if not isinstance(calculation_results, str):
+                calculation_results = orjson.dumps(calculation_results, default=str).decode()
+            
+            formatted_prompt = self._synthesis_template.render(
                 question=question,
                 retrieved_info=retrieved_info,
-                calculation_results=str(calculation_results)
+                calculation_results=calculation_results
             )
             
-            messages = self.llm_service.create_conversation(system_prompt=self.system_prompt, user_message=formatted_prompt)
+            messages = self._build_messages(formatted_prompt)
             
-            response = await self.llm_service.call_llm(messages)
+            response = await self._call_llm(messages)
 
             if response["status"] != "success":
                 # Try fallback synthesis if primary LLM fails
-                logger.warning(f"Primary LLM synthesis failed: {response.get('error')}, attempting fallback")
+                logger.warning("Primary LLM synthesis failed: %s, attempting fallback", response.get('error'))
                 return self._fallback_synthesis(question, execution_results)
             
             content = response.get("content", "").strip()
@@ -284,31 +525,80 @@ class GeotechAgent:
                 return self._fallback_synthesis(question, execution_results)
             
             final_content = content
-            duration_ms = (time.time() - start_time) * 1000
-            trace_logger.log_agent_step("synthesis", f"Answer synthesis completed", duration_ms=duration_ms)
-            logger.info(f"[{trace_id}] EXITING agent.synthesize")
+            duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+            trace_logger.log_agent_step("synthesis", "Answer synthesis completed", duration_ms=duration_ms)
+            logger.debug("[%s] EXITING agent.synthesize", trace_id)
             return final_content
             
         except Exception as e:
-            logger.error(f"[{trace_id}] Synthesis failed: {e}", exc_info=True)
+            logger.error("[%s] Synthesis failed: %s", trace_id, e, exc_info=True)
             raise
 
     async def run(self, question: str, trace_id: Optional[str] = None) -> AskResponse:
         """Main entry point: Execute full Plan → Execute → Synthesize workflow"""
         if not trace_id:
-            trace_id = str(uuid.uuid4())
+            trace_id = token_hex(16)
         
-        self.total_requests += 1
-        langfuse_client = get_langfuse_client()
-        langfuse_trace_id = langfuse_client.start_trace("agent_workflow")
+        self._total_requests = next(self._request_counter)
+        # Stage spans are buffered and sent to LangFuse once the request is done
+        stage_spans = []
+        workflow_status = "SUCCESS"
+        # Speculative tasks started for this request; settled before returning
+        background_tasks: List[asyncio.Task] = []
+        prefetch_task: Optional["asyncio.Task[List[Citation]]"] = None
         
-        with time_request():
+        async with time_request():
+            # Every log record emitted for this request, including from spawned tasks, carries trace_id
+            trace_token = set_trace_id(trace_id)
             try:
-                trace_logger = get_trace_logger(trace_id)
-                trace_logger.info(f"Starting agent workflow for question: {question}")
+                trace_logger = get_trace_logger()
+                trace_logger.info("Starting agent workflow for question: %s", question)
                 
-                plan = await self.plan(question, trace_id)
-                execution_results = await self.execute(plan, question, trace_id)
+                await self._check_index_version()
+                cache_key = self.answer_cache.make_key(question, self._cache_namespace)
+                cached_response = self.answer_cache.get(cache_key)
+                if cached_response is not None:
+                    trace_logger.info("Answer served from cache")
+                    return cached_response.model_copy(update={"trace_id": trace_id})
+                
+                stage_start = datetime.now(timezone.utc)
+                # Most knowledge questions end up retrieving with the question itself, so start
+                # the search and the planning LLM call alongside the semantic cache lookup
+                embedding_task = asyncio.create_task(self._embed_question(question))
+                plan_task = asyncio.create_task(self.plan(question, trace_id, trace_logger))
+                background_tasks.append(plan_task)
+                if _NUMERIC_INPUT_RE.search(question) is None:
+                    prefetch_task = asyncio.create_task(self._search_knowledge_base(question))
+                    background_tasks.append(prefetch_task)
+                
+                question_embedding = await embedding_task
+                if question_embedding is not None:
+                    cached_response = self.answer_cache.get_similar(question_embedding)
+                    if cached_response is not None:
+                        trace_logger.info("Answer served from semantic cache")
+                        return cached_response.model_copy(update={"trace_id": trace_id})
+                
+                plan = await plan_task
+                stage_spans.append(self._stage_span("planning", stage_start, {"action": plan.get("action")}))
+                
+                # The plan alone decides an out-of-scope answer; there is nothing to execute or synthesize
+                if plan.get("action") == "out_of_scope":
+                    response = AskResponse.model_construct(
+                        answer=OUT_OF_SCOPE_ANSWER,
+                        citations=[],
+                        trace_id=trace_id
+                    )
+                    self.answer_cache.set(cache_key, response)
+                    trace_logger.info("Question out of scope, skipping execution and synthesis")
+                    return response
+                
+                prefetched_citations = await self._resolve_prefetched_citations(prefetch_task, plan, question)
+                
+                stage_start = datetime.now(timezone.utc)
+                execution_results = await self.execute(
+                    plan, question, trace_id, trace_logger, prefetched_citations=prefetched_citations
+                )
+                stage_spans.append(self._stage_span("execution", stage_start))
                 
                 # DEBUG: Log execution results
                 print(f"\n=== AGENT DEBUG: Execution Results ===", flush=True)
@@ -319,7 +609,9 @@ class GeotechAgent:
                     print(f"First citation type: {type(execution_results['citations'][0])}", flush=True)
                 print(f"=== END AGENT DEBUG ===\n", flush=True)
                 
-                final_answer = await self.synthesize(question, execution_results, trace_id)
+                stage_start = datetime.now(timezone.utc)
+                final_answer = await self.synthesize(question, execution_results, trace_id, trace_logger)
+                stage_spans.append(self._stage_span("synthesis", stage_start))
                 
                 citations = execution_results.get("citations", [])
                 print(f"\n=== RESPONSE CONSTRUCTION DEBUG ===")
@@ -327,22 +619,78 @@ class GeotechAgent:
                 print(f"Final citations type: {type(citations)}")
                 print(f"=== END RESPONSE DEBUG ===\n")
                 
-                response = AskResponse(
+                # Citations are already validated Citation instances from RAGService.search
+                response = AskResponse.model_construct(
                     answer=final_answer,
                     citations=citations,
                     trace_id=trace_id
                 )
                 
+                if self._is_cacheable(execution_results):
+                    # Only pure knowledge answers are offered to similar questions; calculation
+                    # questions that differ only in their numbers embed almost identically
+                    semantic_embedding = question_embedding if plan.get("action") == "retrieve" else None
+                    self.answer_cache.set(cache_key, response, embedding=semantic_embedding)
+                
                 trace_logger.info("Agent workflow completed successfully")
                 return response
                 
             except Exception as e:
-                logger.error(f"[{trace_id}] Agent workflow failed critically: {e}", exc_info=True)
+                workflow_status = "ERROR"
+                logger.error("[%s] Agent workflow failed critically: %s", trace_id, e, exc_info=True)
                 return AskResponse(
                     answer=f"I apologize, but I encountered a critical error. Error: {str(e)}",
                     citations=[],
                     trace_id=trace_id
                 )
+            
+            finally:
+                # Cancel whatever is still running and retrieve failures, so an abandoned
+                # speculative task never logs "Task exception was never retrieved"
+                for task in background_tasks:
+                    task.cancel()
+                await asyncio.gather(*background_tasks, return_exceptions=True)
+                if self._langfuse_client is not None:
+                    self._langfuse_client.record_trace(trace_id, "agent_workflow", stage_spans, workflow_status)
+                reset_trace_id(trace_token)
+    
+    @staticmethod
+    def _is_cacheable(execution_results: Dict[str, Any]) -> bool:
+        """Only cache clean out-of-scope answers and answers grounded in citations"""
+        if "execution_error" in execution_results:
+            return False
+        return bool(execution_results.get("out_of_scope") or execution_results.get("citations"))
+    
+    @staticmethod
+    def _stage_span(name: str, start_time: datetime, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Build a buffered LangFuse span for a finished workflow stage"""
+        return {
+            "name": name,
+            "start_time": start_time,
+            "end_time": datetime.now(timezone.utc),
+            "metadata": metadata
+        }
+
+    def _reset_counters(self) -> None:
+        """Start the usage counters from zero"""
+        self._request_counter = itertools.count(1)
+        self._tool_counter = itertools.count(1)
+        self._retrieval_counter = itertools.count(1)
+        self._total_requests = 0
+        self._tool_calls = 0
+        self._retrieval_calls = 0
+    
+    @property
+    def total_requests(self) -> int:
+        return self._total_requests
+    
+    @property
+    def tool_calls(self) -> int:
+        return self._tool_calls
+    
+    @property
+    def retrieval_calls(self) -> int:
+        return self._retrieval_calls
 
     def get_statistics(self) -> Dict[str, int]:
         """Get agent usage statistics"""
@@ -356,7 +704,14 @@ class GeotechAgent:
     
     def reset_statistics(self):
         """Reset all usage statistics"""
-        self.total_requests = 0
-        self.tool_calls = 0
-        self.retrieval_calls = 0
-        self.llm_service.reset_statistics()
\ No newline at end of file
+        self._reset_counters()
+        self.llm_service.reset_statistics()
+
+
+@lru_cache(maxsize=1)
+def get_agent() -> GeotechAgent:
+    """
+    Get the process-wide GeotechAgent. Building an agent sets up the LLM, embedding,
+    Qdrant and MongoDB clients, so requests share one instance and its warm connections.
+    """
+    return GeotechAgent()
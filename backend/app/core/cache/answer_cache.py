@@ -0,0 +1,176 @@
+"""
+Answer Cache
+In-process LRU + TTL cache of agent answers keyed by normalized question,
+with an optional embedding-similarity tier for paraphrased questions
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.api.schema.response import AskResponse
+from app.core.config.constants import CacheConstants
+
+logger = logging.getLogger(__name__)
+
+class AnswerCache:
+    """Thread-safe LRU cache of AskResponse objects with per-entry expiry"""
+
+    def __init__(
+        self,
+        max_size: int = CacheConstants.ANSWER_CACHE_MAX_SIZE,
+        ttl_seconds: float = CacheConstants.ANSWER_CACHE_TTL_SECONDS,
+        semantic_max_size: int = CacheConstants.SEMANTIC_CACHE_MAX_SIZE,
+        similarity_threshold: float = CacheConstants.SEMANTIC_SIMILARITY_THRESHOLD
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.semantic_max_size = semantic_max_size
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[str, Tuple[float, AskResponse]]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.semantic_hits = 0
+
+        # Semantic tier: unit-normalized question embeddings in a fixed-size matrix,
+        # allocated on first use once the embedding dimension is known
+        self._vectors: Optional[np.ndarray] = None
+        self._slot_keys: List[Optional[str]] = [None] * semantic_max_size
+        self._key_slots: "OrderedDict[str, int]" = OrderedDict()
+        self._free_slots: List[int] = list(range(semantic_max_size - 1, -1, -1))
+
+    @staticmethod
+    def make_key(question: str, namespace: str) -> str:
+        """Build a cache key from the case/whitespace-normalized question"""
+        normalized = " ".join(question.lower().split())
+        return hashlib.sha256(f"{namespace}\x00{normalized}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[AskResponse]:
+        """Return the cached response for key, or None if missing or expired"""
+        with self._lock:
+            response = self._lookup(key)
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return response
+
+    def get_similar(self, embedding: Sequence[float]) -> Optional[AskResponse]:
+        """Return the cached response whose question embedding is closest to embedding,
+        if its cosine similarity reaches the threshold"""
+        with self._lock:
+            if not self._key_slots:
+                return None
+
+            query = self._normalize(embedding)
+            if query is None or query.shape[0] != self._vectors.shape[1]:
+                return None
+
+            scores = self._vectors @ query
+            slot = int(np.argmax(scores))
+            if scores[slot] < self.similarity_threshold:
+                return None
+
+            key = self._slot_keys[slot]
+            response = self._lookup(key)
+            if response is not None:
+                # Keep the semantic tier's eviction order least-recently-used too
+                self._key_slots.move_to_end(key)
+                self.semantic_hits += 1
+            return response
+
+    def set(self, key: str, response: AskResponse, embedding: Optional[Sequence[float]] = None) -> None:
+        """Store a response, evicting the least recently used entries beyond max_size.
+        Responses stored with an embedding can also be served to similar questions."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._drop_embedding(evicted_key)
+
+            if embedding is not None:
+                self._index_embedding(key, embedding)
+
+    def clear(self) -> None:
+        """Drop all cached answers (e.g. after the knowledge base is re-indexed)"""
+        with self._lock:
+            self._entries.clear()
+            self._vectors = None
+            self._slot_keys = [None] * self.semantic_max_size
+            self._key_slots.clear()
+            self._free_slots = list(range(self.semantic_max_size - 1, -1, -1))
+            logger.info("Answer cache cleared")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _lookup(self, key: str) -> Optional[AskResponse]:
+        """Return a live entry and mark it recently used. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, response = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._drop_embedding(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return response
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Optional[np.ndarray]:
+        try:
+            vector = np.asarray(embedding, dtype=np.float32)
+        except (TypeError, ValueError):
+            return None
+        if vector.ndim != 1:
+            return None
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        return vector / norm
+
+    def _index_embedding(self, key: str, embedding: Sequence[float]) -> None:
+        """Add or replace key's embedding in the semantic tier. Caller holds the lock."""
+        if self.semantic_max_size <= 0:
+            return
+
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+            # First embedding, or the embedding model changed: start a fresh index
+            self._vectors = np.zeros((self.semantic_max_size, vector.shape[0]), dtype=np.float32)
+            self._slot_keys = [None] * self.semantic_max_size
+            self._key_slots.clear()
+            self._free_slots = list(range(self.semantic_max_size - 1, -1, -1))
+
+        slot = self._key_slots.pop(key, None)
+        if slot is None:
+            if not self._free_slots:
+                self._drop_embedding(next(iter(self._key_slots)))
+            slot = self._free_slots.pop()
+
+        self._vectors[slot] = vector
+        self._slot_keys[slot] = key
+        self._key_slots[key] = slot
+
+    def _drop_embedding(self, key: str) -> None:
+        """Remove key from the semantic tier if present. Caller holds the lock."""
+        slot = self._key_slots.pop(key, None)
+        if slot is None:
+            return
+        self._vectors[slot] = 0.0
+        self._slot_keys[slot] = None
+        self._free_slots.append(slot)
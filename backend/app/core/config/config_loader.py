@@ -4,6 +4,7 @@ Utilities for loading and validating YAML configuration files
 """
 
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 
@@ -27,19 +28,16 @@ class ConfigLoader:
             raise ConfigurationError(f"Agent configuration file not found: {config_path}")
         
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
-            
-            # Validate required sections
-            self._validate_agent_config(config)
-            return config
+            # Parsed once per file version; editing the file changes its mtime and reloads it
+            return _load_agent_config_file(str(config_path), config_path.stat().st_mtime_ns)
             
         except yaml.YAMLError as e:
             raise ConfigurationError(f"Invalid YAML syntax in {config_path}: {e}")
         except Exception as e:
             raise ConfigurationError(f"Error loading agent config: {e}")
     
-    def _validate_agent_config(self, config: Dict[str, Any]) -> None:
+    @staticmethod
+    def _validate_agent_config(config: Dict[str, Any]) -> None:
         """Validate agent configuration structure"""
         required_sections = [
             "agent_info",
@@ -129,6 +127,17 @@ class ConfigLoader:
             "citation_style": "academic"
         })
     
+@lru_cache(maxsize=1)
+def _load_agent_config_file(config_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse and validate the agent YAML. Cached per (path, mtime); treat the result as read-only."""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    
+    # Validate required sections
+    ConfigLoader._validate_agent_config(config)
+    return config
+
+@lru_cache(maxsize=1)
 def get_config_loader() -> ConfigLoader:
     """Get configuration loader instance"""
     return ConfigLoader()
@@ -182,4 +191,5 @@ def validate_configuration() -> bool:
         
     except Exception as e:
         print(f"❌ Configuration validation failed: {e}")
-        return False
\ No newline at end of file
+        return False
+
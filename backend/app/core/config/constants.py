@@ -26,8 +26,14 @@ class RAGConstants:
     MAX_PAGES_PER_CHUNK = 5
     CHUNKING_PAGE_THRESHOLD = 5
     OCR_MAX_RETRIES = 3
+    OCR_BACKOFF_BASE_SECONDS = 1.0
+    OCR_BACKOFF_MAX_SECONDS = 30.0
     OCR_MAX_OUTPUT_TOKENS = 32768
     OCR_TEMPERATURE = 0.1
+    OCR_MAX_CONCURRENCY = 4
+    OCR_UPLOAD_TTL_SECONDS = 47 * 3600  # GenAI deletes uploaded files after 48h
+    OCR_CHUNK_BATCH_SIZE = 3  # Max non-first chunks sent in one generate_content call
+    OCR_ESTIMATED_TOKENS_PER_PAGE = 1500
     
     # PDF utilities constants
     PDF_TEXT_SAMPLE_MAX_PAGES = 2
@@ -37,12 +43,19 @@ class RAGConstants:
 class DatabaseConstants:
     DEFAULT_QDRANT_HOST = "localhost"
     DEFAULT_QDRANT_PORT = 6333
+    DEFAULT_QDRANT_GRPC_PORT = 6334
     DEFAULT_MONGODB_HOST = "localhost"  
     DEFAULT_MONGODB_PORT = 27017
     DEFAULT_VECTOR_SIZE = 3072
     DEFAULT_QDRANT_COLLECTION = "geotech_knowledge"
     DEFAULT_MONGODB_DATABASE = "geotech_db"
     DEFAULT_MONGODB_COLLECTION = "documents"
+    MONGODB_MAX_POOL_SIZE = 100
+    MONGODB_MIN_POOL_SIZE = 10
+    MONGODB_TIMEOUT_MS = 5000
+    MONGODB_BULK_BATCH_SIZE = 1000
+    QDRANT_UPSERT_BATCH_SIZE = 512
+    QDRANT_QUANTIZATION_OVERSAMPLING = 2.0
 
 # LLM Configuration Constants
 class LLMConstants:
@@ -55,6 +68,11 @@ class LLMConstants:
     DEFAULT_TEMPERATURE = 0.1
     DEFAULT_MAX_TOKENS = 8192
     DEFAULT_MAX_COMPLETION_TOKENS = 3000
+    DEFAULT_MAX_CONCURRENCY = 32
+    HTTP_MAX_CONNECTIONS = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = 50
+    EMBEDDING_BATCH_SIZE = 96
+    EMBEDDING_MAX_CONCURRENCY = 8
 
 # API Configuration Constants
 class APIConstants:
@@ -63,6 +81,16 @@ class APIConstants:
     DEFAULT_QUESTION_MAX_LENGTH = 1000
     DEFAULT_API_DOCS_ENABLED = True
 
+# Cache Configuration Constants
+class CacheConstants:
+    ANSWER_CACHE_MAX_SIZE = 1024
+    ANSWER_CACHE_TTL_SECONDS = 3600
+    SEMANTIC_CACHE_ENABLED = True
+    SEMANTIC_CACHE_MAX_SIZE = 256
+    SEMANTIC_SIMILARITY_THRESHOLD = 0.95
+    QUERY_EMBEDDING_CACHE_MAX_SIZE = 1024
+    INDEX_VERSION_CHECK_SECONDS = 30
+
 # Validation Constants
 class ValidationConstants:
     MIN_TEMPERATURE = 0.0
@@ -92,4 +120,6 @@ class ToolConstants:
         30: (37.2, 22.5, 19.7),
         35: (57.8, 41.4, 42.4),
         40: (95.7, 81.3, 100.4)
-    }
\ No newline at end of file
+    }
+    # (phi, Nc, Nq, Nr) rows sorted by friction angle
+    BEARING_CAPACITY_ROWS = tuple(sorted((phi, *factors) for phi, factors in BEARING_CAPACITY_FACTORS.items()))
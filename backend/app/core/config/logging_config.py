@@ -3,16 +3,36 @@ Logging Configuration
 Structured logging setup with trace_id support for observability
 """
 
+import atexit
+import copy
 import logging
 import logging.config
-import json
+import queue
 import sys
+import time
+from contextvars import ContextVar, Token
 from datetime import datetime, timezone
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+import orjson
 
 from .settings import get_settings
 
+# Trace id of the request being handled. asyncio tasks and asyncio.to_thread copy the
+# current context, so everything logged on behalf of a request carries its trace id.
+_trace_id_ctx: ContextVar[str] = ContextVar("trace_id", default="no-trace")
+
+class TraceContextFilter(logging.Filter):
+    """Stamps the current request's trace_id on records that don't carry one"""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, 'trace_id', None):
+            record.trace_id = _trace_id_ctx.get()
+        return True
+
 class TraceFormatter(logging.Formatter):
     """Custom formatter that includes trace_id in log records"""
     
@@ -33,59 +53,131 @@ class TraceFormatter(logging.Formatter):
 class JSONFormatter(logging.Formatter):
     """JSON formatter for structured logging"""
     
+    # Optional structured fields copied from `extra` when present
+    EXTRA_FIELDS = ("agent_step", "duration_ms", "tool_name", "retrieval_count")
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (epoch second, formatted "YYYY-MM-DDTHH:MM:SS") - records mostly share the current second
+        self._second_cache: Tuple[int, str] = (-1, "")
+    
+    def _format_timestamp(self, created: float) -> str:
+        """ISO-8601 UTC timestamp matching datetime.isoformat(), e.g. 2025-01-01T12:00:00.123456+00:00"""
+        second = int(created)
+        cached_second, prefix = self._second_cache
+        if cached_second != second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._second_cache = (second, prefix)
+        microseconds = min(int((created - second) * 1_000_000), 999_999)
+        return f"{prefix}.{microseconds:06d}+00:00"
+    
     def format(self, record: logging.LogRecord) -> str:
+        record_fields = record.__dict__
         log_data = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": self._format_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
             "module": record.module,
             "function": record.funcName,
             "line": record.lineno,
-            "trace_id": getattr(record, 'trace_id', 'no-trace')
+            "trace_id": record_fields.get('trace_id', 'no-trace')
         }
         
         # Add extra fields if present
-        if hasattr(record, 'agent_step'):
-            log_data["agent_step"] = record.agent_step
-        if hasattr(record, 'duration_ms'):
-            log_data["duration_ms"] = record.duration_ms
-        if hasattr(record, 'tool_name'):
-            log_data["tool_name"] = record.tool_name
-        if hasattr(record, 'retrieval_count'):
-            log_data["retrieval_count"] = record.retrieval_count
+        for field in self.EXTRA_FIELDS:
+            if field in record_fields:
+                log_data[field] = record_fields[field]
             
         # Add exception info if present
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
         
-        return json.dumps(log_data, ensure_ascii=False)
+        return orjson.dumps(log_data, default=str).decode()
 
 class TraceAdapter(logging.LoggerAdapter):
-    """Logger adapter that automatically adds trace_id to log records"""
+    """Logger adapter for agent workflow logging. The trace_id comes from the request
+    context (see TraceContextFilter), so one adapter per logger is shared by all requests."""
+    
+    def __init__(self, logger: logging.Logger):
+        super().__init__(logger, {})
     
-    def __init__(self, logger: logging.Logger, trace_id: str):
-        super().__init__(logger, {"trace_id": trace_id})
-        self.trace_id = trace_id
+    @property
+    def trace_id(self) -> str:
+        return _trace_id_ctx.get()
     
     def process(self, msg: str, kwargs: Dict[str, Any]) -> tuple:
-        """Add trace_id to extra fields"""
-        if "extra" not in kwargs:
-            kwargs["extra"] = {}
-        kwargs["extra"]["trace_id"] = self.trace_id
+        """Pass records through unchanged; trace_id is added by the handler filter"""
         return msg, kwargs
     
-    def log_agent_step(self, step: str, message: str, duration_ms: Optional[float] = None, **extra) -> None:
+    def log_agent_step(
+        self,
+        step: str,
+        message: str,
+        *args,
+        duration_ms: Optional[float] = None,
+        **extra
+    ) -> None:
         """Log agent workflow step with structured data"""
-        log_extra = {
-            "trace_id": self.trace_id,
-            "agent_step": step,
-            **extra
-        }
+        if not self.isEnabledFor(logging.INFO):
+            return
+        log_extra = {"agent_step": step, **extra}
         if duration_ms is not None:
             log_extra["duration_ms"] = duration_ms
             
-        self.info(message, extra=log_extra)
+        self.info(message, *args, extra=log_extra, stacklevel=2)
+
+class LocalQueueHandler(QueueHandler):
+    """QueueHandler for an in-process queue. Unlike the base class it keeps exc_info
+    (nothing is pickled), so the file formatter can still render the exception."""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Work on a copy: later handlers (console, caplog) still need the original msg/args
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+# Drains queued records to the log files on a background thread
+_file_log_listener: Optional[QueueListener] = None
+
+def _start_file_logging(logs_dir: Path) -> QueueHandler:
+    """Start the file log listener and return the handler that feeds it.
+    Log calls on the event loop only enqueue; writes and rotation happen off-thread."""
+    global _file_log_listener
+    if _file_log_listener is not None:
+        _file_log_listener.stop()
+    
+    json_formatter = JSONFormatter()
+    file_handlers = []
+    for filename, level in (("info.log", logging.INFO), ("error.log", logging.ERROR)):
+        handler = RotatingFileHandler(
+            logs_dir / filename,
+            maxBytes=10485760,  # 10MB
+            backupCount=5,
+            encoding="utf-8"
+        )
+        handler.setLevel(level)
+        handler.setFormatter(json_formatter)
+        file_handlers.append(handler)
+    
+    log_queue = queue.SimpleQueue()
+    _file_log_listener = QueueListener(log_queue, *file_handlers, respect_handler_level=True)
+    _file_log_listener.start()
+    
+    queue_handler = LocalQueueHandler(log_queue)
+    # trace_id lives in the producer's context, so stamp it before the record changes threads
+    queue_handler.addFilter(TraceContextFilter())
+    return queue_handler
+
+def _stop_file_logging() -> None:
+    """Flush queued records to disk and stop the listener thread"""
+    global _file_log_listener
+    if _file_log_listener is not None:
+        _file_log_listener.stop()
+        _file_log_listener = None
+
+atexit.register(_stop_file_logging)
 
 def setup_logging() -> None:
     """Setup application logging configuration"""
@@ -99,14 +191,16 @@ def setup_logging() -> None:
     config = {
         "version": 1,
         "disable_existing_loggers": False,
+        "filters": {
+            "trace_context": {
+                "()": TraceContextFilter
+            }
+        },
         "formatters": {
             "default": {
                 "()": TraceFormatter,
                 "format": "[{timestamp}] {levelname:8} | {trace_id:12} | {name:25} | {message}",
                 "style": "{"
-            },
-            "json": {
-                "()": JSONFormatter
             }
         },
         "handlers": {
@@ -114,31 +208,14 @@ def setup_logging() -> None:
                 "class": "logging.StreamHandler",
                 "formatter": "default",
                 "level": settings.LOG_LEVEL,
+                "filters": ["trace_context"],
                 "stream": sys.stdout
-            },
-            "file_info": {
-                "class": "logging.handlers.RotatingFileHandler",
-                "formatter": "json",
-                "level": "INFO",
-                "filename": str(logs_dir / "info.log"),
-                "maxBytes": 10485760,  # 10MB
-                "backupCount": 5,
-                "encoding": "utf-8"
-            },
-            "file_error": {
-                "class": "logging.handlers.RotatingFileHandler",
-                "formatter": "json",
-                "level": "ERROR", 
-                "filename": str(logs_dir / "error.log"),
-                "maxBytes": 10485760,  # 10MB
-                "backupCount": 5,
-                "encoding": "utf-8"
             }
         },
         "loggers": {
             "app": {
                 "level": settings.LOG_LEVEL,
-                "handlers": ["console", "file_info", "file_error"],
+                "handlers": ["console"],
                 "propagate": False
             },
             "uvicorn": {
@@ -148,7 +225,7 @@ def setup_logging() -> None:
             },
             "uvicorn.error": {
                 "level": "INFO",
-                "handlers": ["console", "file_error"],
+                "handlers": ["console"],
                 "propagate": False
             },
             "uvicorn.access": {
@@ -166,14 +243,36 @@ def setup_logging() -> None:
     # Apply configuration
     logging.config.dictConfig(config)
     
+    # File handlers sit behind a queue so logging never blocks the event loop on disk I/O
+    file_queue_handler = _start_file_logging(logs_dir)
+    logging.getLogger("app").addHandler(file_queue_handler)
+    uvicorn_error_handler = LocalQueueHandler(file_queue_handler.queue)
+    uvicorn_error_handler.setLevel(logging.ERROR)
+    uvicorn_error_handler.addFilter(TraceContextFilter())
+    logging.getLogger("uvicorn.error").addHandler(uvicorn_error_handler)
+    
     # Log setup completion
     logger = logging.getLogger("app.config")
     logger.info(f"Logging configured - Level: {settings.LOG_LEVEL}, Logs dir: {logs_dir}")
 
-def get_trace_logger(trace_id: str, logger_name: str = "app") -> TraceAdapter:
-    """Get a logger adapter with trace_id context"""
-    base_logger = logging.getLogger(logger_name)
-    return TraceAdapter(base_logger, trace_id)
+def set_trace_id(trace_id: str) -> Token:
+    """Bind trace_id to the current context; pass the token to reset_trace_id when done"""
+    return _trace_id_ctx.set(trace_id)
+
+def reset_trace_id(token: Token) -> None:
+    """Restore the trace_id that was current before set_trace_id"""
+    _trace_id_ctx.reset(token)
+
+@lru_cache(maxsize=None)
+def _get_trace_adapter(logger_name: str) -> TraceAdapter:
+    return TraceAdapter(logging.getLogger(logger_name))
+
+def get_trace_logger(*, logger_name: str = "app") -> TraceAdapter:
+    """
+    Return the shared trace logger. It logs under whatever trace_id is bound with
+    set_trace_id; binding is left to the caller so it is always paired with a reset.
+    """
+    return _get_trace_adapter(logger_name)
 
 # Initialize logging when module is imported
 if not logging.getLogger().hasHandlers():
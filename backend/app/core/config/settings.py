@@ -4,9 +4,10 @@ Pydantic-based settings management with environment variable validation
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List
-from pydantic import Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from pydantic_settings import BaseSettings
 
 from .constants import (
@@ -14,6 +15,15 @@ from .constants import (
     APIConstants, AppConstants, ValidationConstants
 )
 
+# Backend project root (app/core/config/settings.py -> backend/)
+_PROJECT_ROOT = Path(__file__).resolve().parents[3]
+# Logs directory, set once it has been created
+_LOGS_DIR: Optional[Path] = None
+
+# Allowed values for the LOG_LEVEL / ENVIRONMENT validators
+_VALID_LOG_LEVELS = frozenset({"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"})
+_VALID_ENVIRONMENTS = frozenset({"development", "staging", "production", "testing"})
+
 class GeotechSettings(BaseSettings):
     """Main application settings with environment variable binding"""
     
@@ -30,6 +40,7 @@ class GeotechSettings(BaseSettings):
     # Qdrant Configuration  
     QDRANT_HOST: str = Field(default=DatabaseConstants.DEFAULT_QDRANT_HOST, description="Qdrant server host")
     QDRANT_PORT: int = Field(default=DatabaseConstants.DEFAULT_QDRANT_PORT, description="Qdrant server port")
+    QDRANT_GRPC_PORT: int = Field(default=DatabaseConstants.DEFAULT_QDRANT_GRPC_PORT, description="Qdrant gRPC port")
     QDRANT_COLLECTION_NAME: str = Field(default=DatabaseConstants.DEFAULT_QDRANT_COLLECTION, description="Qdrant collection name")
     
     # MongoDB Configuration
@@ -62,6 +73,7 @@ class GeotechSettings(BaseSettings):
     LLM_MAX_RETRIES: int = Field(default=LLMConstants.DEFAULT_MAX_RETRIES, description="Maximum LLM API retry attempts")
     LLM_TEMPERATURE: float = Field(default=LLMConstants.DEFAULT_TEMPERATURE, description="LLM temperature for responses")
     LLM_MAX_COMPLETION_TOKENS: int = Field(default=LLMConstants.DEFAULT_MAX_COMPLETION_TOKENS, description="Maximum completion tokens in LLM response")
+    LLM_MAX_CONCURRENCY: int = Field(default=LLMConstants.DEFAULT_MAX_CONCURRENCY, ge=1, description="Maximum concurrent LLM API calls per agent")
     
     # Agent Configuration  
     AGENT_CONFIG_PATH: str = Field(default="app/core/config/agents/geotech_agent.yaml", description="Path to agent configuration file")
@@ -74,18 +86,18 @@ class GeotechSettings(BaseSettings):
     @field_validator("LOG_LEVEL")
     @classmethod
     def validate_log_level(cls, v):
-        valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        if v.upper() not in valid_levels:
-            raise ValueError(f"LOG_LEVEL must be one of: {valid_levels}")
-        return v.upper()
+        level = v.upper()
+        if level not in _VALID_LOG_LEVELS:
+            raise ValueError(f"LOG_LEVEL must be one of: {sorted(_VALID_LOG_LEVELS)}")
+        return level
     
     @field_validator("ENVIRONMENT")
     @classmethod
     def validate_environment(cls, v):
-        valid_envs = ["development", "staging", "production", "testing"]
-        if v.lower() not in valid_envs:
-            raise ValueError(f"ENVIRONMENT must be one of: {valid_envs}")
-        return v.lower()
+        environment = v.lower()
+        if environment not in _VALID_ENVIRONMENTS:
+            raise ValueError(f"ENVIRONMENT must be one of: {sorted(_VALID_ENVIRONMENTS)}")
+        return environment
     
     @field_validator("SIMILARITY_THRESHOLD")
     @classmethod
@@ -103,15 +115,16 @@ class GeotechSettings(BaseSettings):
     
     def get_agent_config_path(self) -> Path:
         """Get absolute path to agent configuration file"""
-        base_path = Path(__file__).parent.parent.parent.parent  # Go to project root
-        return base_path / self.AGENT_CONFIG_PATH
+        return _PROJECT_ROOT / self.AGENT_CONFIG_PATH
     
     def get_logs_directory(self) -> Path:
-        """Get logs directory path"""
-        base_path = Path(__file__).parent.parent.parent.parent
-        logs_dir = base_path / "logs"
-        logs_dir.mkdir(exist_ok=True)
-        return logs_dir
+        """Get logs directory path (created on first call)"""
+        global _LOGS_DIR
+        if _LOGS_DIR is None:
+            logs_dir = _PROJECT_ROOT / "logs"
+            logs_dir.mkdir(exist_ok=True)
+            _LOGS_DIR = logs_dir
+        return _LOGS_DIR
     
     def is_production(self) -> bool:
         """Check if running in production environment"""
@@ -129,46 +142,100 @@ class GeotechSettings(BaseSettings):
         """Check if LangFuse is configured"""
         return bool(self.LANGFUSE_PUBLIC_KEY and self.LANGFUSE_SECRET_KEY)
 
+@lru_cache(maxsize=1)
 def get_settings() -> GeotechSettings:
-    """Get application settings"""
+    """Get application settings (parsed from the environment and .env once per process)"""
     return GeotechSettings()
 
-# Convenience function for common settings
-def get_openai_config() -> dict:
-    """Get OpenAI configuration as dictionary"""
+def reset_settings() -> None:
+    """Drop the cached settings so the next get_settings() re-reads the environment (for tests)"""
+    # Imported here: config_loader imports this module
+    from .config_loader import get_config_loader
+    
+    get_settings.cache_clear()
+    get_config_loader.cache_clear()
+    for config_getter in (get_openai_config, get_qdrant_config, get_rag_config, get_mongodb_config):
+        config_getter.cache_clear()
+
+# Typed views of common settings groups. Built with model_construct from the already
+# validated settings, once per settings instance (reset_settings clears them too).
+
+class OpenAIConfig(BaseModel):
+    """OpenAI LLM configuration"""
+    model_config = ConfigDict(frozen=True)
+    
+    api_key: str
+    model: str
+    timeout: int
+    max_retries: int
+    temperature: float
+    max_completion_tokens: int
+
+class QdrantConfig(BaseModel):
+    """Qdrant connection configuration"""
+    model_config = ConfigDict(frozen=True)
+    
+    host: str
+    port: int
+    grpc_port: int
+    collection_name: str
+
+class RAGConfig(BaseModel):
+    """Retrieval configuration"""
+    model_config = ConfigDict(frozen=True)
+    
+    top_k: int
+    similarity_threshold: float
+
+class MongoDBConfig(BaseModel):
+    """MongoDB connection configuration"""
+    model_config = ConfigDict(frozen=True)
+    
+    host: str
+    port: int
+    database: str
+    collection: str
+
+@lru_cache(maxsize=1)
+def get_openai_config() -> OpenAIConfig:
+    """Get OpenAI configuration"""
     settings = get_settings()
-    return {
-        "api_key": settings.OPENAI_API_KEY,
-        "model": settings.OPENAI_MODEL,
-        "timeout": settings.LLM_TIMEOUT,
-        "max_retries": settings.LLM_MAX_RETRIES,
-        "temperature": settings.LLM_TEMPERATURE,
-        "max_completion_tokens": settings.LLM_MAX_COMPLETION_TOKENS
-    }
-
-def get_qdrant_config() -> dict:
-    """Get Qdrant configuration as dictionary"""
+    return OpenAIConfig.model_construct(
+        api_key=settings.OPENAI_API_KEY,
+        model=settings.OPENAI_MODEL,
+        timeout=settings.LLM_TIMEOUT,
+        max_retries=settings.LLM_MAX_RETRIES,
+        temperature=settings.LLM_TEMPERATURE,
+        max_completion_tokens=settings.LLM_MAX_COMPLETION_TOKENS
+    )
+
+@lru_cache(maxsize=1)
+def get_qdrant_config() -> QdrantConfig:
+    """Get Qdrant configuration"""
     settings = get_settings()
-    return {
-        "host": settings.QDRANT_HOST,
-        "port": settings.QDRANT_PORT,
-        "collection_name": settings.QDRANT_COLLECTION_NAME
-    }
-
-def get_rag_config() -> dict:
-    """Get RAG configuration as dictionary"""
+    return QdrantConfig.model_construct(
+        host=settings.QDRANT_HOST,
+        port=settings.QDRANT_PORT,
+        grpc_port=settings.QDRANT_GRPC_PORT,
+        collection_name=settings.QDRANT_COLLECTION_NAME
+    )
+
+@lru_cache(maxsize=1)
+def get_rag_config() -> RAGConfig:
+    """Get RAG configuration"""
     settings = get_settings()
-    return {
-        "top_k": settings.TOP_K_RETRIEVAL,
-        "similarity_threshold": settings.SIMILARITY_THRESHOLD
-    }
+    return RAGConfig.model_construct(
+        top_k=settings.TOP_K_RETRIEVAL,
+        similarity_threshold=settings.SIMILARITY_THRESHOLD
+    )
 
-def get_mongodb_config() -> dict:
-    """Get MongoDB configuration as dictionary"""
+@lru_cache(maxsize=1)
+def get_mongodb_config() -> MongoDBConfig:
+    """Get MongoDB configuration"""
     settings = get_settings()
-    return {
-        "host": settings.MONGODB_HOST,
-        "port": settings.MONGODB_PORT,
-        "database": settings.MONGODB_DATABASE,
-        "collection": settings.MONGODB_COLLECTION
-    }
\ No newline at end of file
+    return MongoDBConfig.model_construct(
+        host=settings.MONGODB_HOST,
+        port=settings.MONGODB_PORT,
+        database=settings.MONGODB_DATABASE,
+        collection=settings.MONGODB_COLLECTION
+    )
@@ -1,40 +1,203 @@
 import asyncio
-from typing import List
-from openai import OpenAI
+import base64
+import logging
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from openai import AsyncOpenAI, OpenAI
+
+from app.core.config.constants import CacheConstants, LLMConstants
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=4)
+def _get_openai_client(api_key: str) -> OpenAI:
+    """Shared sync client per API key, so embedding services reuse one connection pool"""
+    return OpenAI(api_key=api_key)
+
+@lru_cache(maxsize=4)
+def _get_async_openai_client(api_key: str) -> AsyncOpenAI:
+    """Shared async client per API key"""
+    return AsyncOpenAI(api_key=api_key)
 
 class OpenAIEmbedding:
     def __init__(self, api_key: str, model: str = "text-embedding-3-large"):
-        self.client = OpenAI(api_key=api_key)
+        self.client = _get_openai_client(api_key)
+        self.aclient = _get_async_openai_client(api_key)
         self.model = model
+        # LRU of float32 query embeddings keyed by (model, query); cached arrays are read-only
+        self._query_cache: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._query_cache_max_size = CacheConstants.QUERY_EMBEDDING_CACHE_MAX_SIZE
+        self._query_cache_lock = Lock()
+        # Query embeddings being fetched right now, so concurrent callers share one request
+        self._query_inflight: Dict[Tuple[str, str], Future] = {}
+        # Embedding width, fixed by the first decoded vector and checked on every later one
+        self.dimension: Optional[int] = None
+    
+    def _decode_embedding(self, item) -> np.ndarray:
+        """
+        Decode one base64-encoded embedding into a read-only float32 vector. A width that
+        differs from earlier vectors means the payload is not the float32 layout assumed here.
+        """
+        embedding = np.frombuffer(base64.b64decode(item.embedding), dtype=np.float32)
+        if self.dimension is None:
+            self.dimension = embedding.shape[0]
+        elif embedding.shape[0] != self.dimension:
+            raise ValueError(
+                f"Decoded embedding has {embedding.shape[0]} values, expected {self.dimension}"
+            )
+        return embedding
+    
+    def _decode_batch(self, response) -> np.ndarray:
+        """Decode a base64-encoded embeddings response into one (N, D) float32 array"""
+        return np.stack([self._decode_embedding(item) for item in response.data])
     
-    def get_embeddings(self, documents) -> List[tuple]:
-        """Get embeddings for documents"""
+    @staticmethod
+    def _batch_texts(documents) -> List[List[str]]:
+        """Split document texts into request-sized batches, preserving order"""
         texts = [doc.get_content() for doc in documents]
+        batch_size = LLMConstants.EMBEDDING_BATCH_SIZE
+        return [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    
+    def get_embeddings(self, documents) -> List[Tuple[object, np.ndarray]]:
+        """
+        Get embeddings for documents as float32 vectors (rows of one contiguous array per batch).
+        Vectors are fetched base64-encoded, which is smaller on the wire than JSON floats.
+        """
+        try:
+            batch_embeddings = [
+                self._decode_batch(self.client.embeddings.create(
+                    input=batch,
+                    model=self.model,
+                    encoding_format="base64"
+                ))
+                for batch in self._batch_texts(documents)
+            ]
+            if not batch_embeddings:
+                return []
+            return list(zip(documents, np.concatenate(batch_embeddings)))
+        except Exception:
+            logger.exception("Error getting embeddings")
+            raise
+    
+    async def get_embeddings_async(self, documents) -> List[Tuple[object, np.ndarray]]:
+        """Async version of get_embeddings; batches are embedded concurrently"""
+        semaphore = asyncio.Semaphore(LLMConstants.EMBEDDING_MAX_CONCURRENCY)
+        
+        async def embed_batch(batch: List[str]) -> np.ndarray:
+            async with semaphore:
+                response = await self.aclient.embeddings.create(
+                    input=batch,
+                    model=self.model,
+                    encoding_format="base64"
+                )
+            return self._decode_batch(response)
         
         try:
-            response = self.client.embeddings.create(
-                input=texts,
-                model=self.model
+            # gather keeps batch order, so embeddings line up with documents
+            batch_embeddings = await asyncio.gather(
+                *(embed_batch(batch) for batch in self._batch_texts(documents))
             )
-            
-            embeddings = [embedding.embedding for embedding in response.data]
-            return list(zip(documents, embeddings))
-        except Exception as e:
-            print(f"Error getting embeddings: {e}")
+            if not batch_embeddings:
+                return []
+            return list(zip(documents, np.concatenate(batch_embeddings)))
+        except Exception:
+            logger.exception("Error getting embeddings")
             raise
     
-    async def get_embeddings_async(self, documents) -> List[tuple]:
-        """Async version of get_embeddings"""
-        return await asyncio.to_thread(self.get_embeddings, documents)
+    def _begin_query_embedding(
+        self, key: Tuple[str, str]
+    ) -> Tuple[Optional[np.ndarray], Optional[Future], bool]:
+        """
+        Look key up in the cache, then among in-flight requests. Returns
+        (cached embedding, future to wait on, whether the caller owns the request).
+        """
+        with self._query_cache_lock:
+            embedding = self._query_cache.get(key)
+            if embedding is not None:
+                self._query_cache.move_to_end(key)
+                return embedding, None, False
+            future = self._query_inflight.get(key)
+            if future is not None:
+                return None, future, False
+            future = Future()
+            self._query_inflight[key] = future
+            return None, future, True
+    
+    def _finish_query_embedding(
+        self,
+        key: Tuple[str, str],
+        future: Future,
+        embedding: Optional[np.ndarray] = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        """Cache a fetched embedding and hand the outcome to callers waiting on it"""
+        with self._query_cache_lock:
+            if embedding is not None:
+                self._query_cache[key] = embedding
+                self._query_cache.move_to_end(key)
+                if len(self._query_cache) > self._query_cache_max_size:
+                    self._query_cache.popitem(last=False)
+            self._query_inflight.pop(key, None)
+        if error is None:
+            future.set_result(embedding)
+        elif isinstance(error, Exception):
+            future.set_exception(error)
+        else:
+            # The owner was cancelled; waiters fail instead of being cancelled with it
+            future.set_exception(RuntimeError("Query embedding request was cancelled"))
     
-    def get_query_embedding(self, query: str) -> List[float]:
-        """Get embedding for a single query"""
+    def get_query_embedding(self, query: str) -> np.ndarray:
+        """
+        Get a float32 embedding for a single query. Repeated queries are served from an
+        in-process LRU, and concurrent requests for the same query (sync or async) share
+        one API call. Use get_embeddings for document texts so they bypass the cache.
+        """
+        key = (self.model, query)
+        embedding, future, owner = self._begin_query_embedding(key)
+        if embedding is not None:
+            return embedding
+        if not owner:
+            return future.result()
+        
         try:
             response = self.client.embeddings.create(
                 input=[query],
-                model=self.model
+                model=self.model,
+                encoding_format="base64"
             )
-            return response.data[0].embedding
-        except Exception as e:
-            print(f"Error getting query embedding: {e}")
-            raise
\ No newline at end of file
+            embedding = self._decode_embedding(response.data[0])
+        except BaseException as e:
+            self._finish_query_embedding(key, future, error=e)
+            logger.exception("Error getting query embedding")
+            raise
+        self._finish_query_embedding(key, future, embedding)
+        return embedding
+    
+    async def get_query_embedding_async(self, query: str) -> np.ndarray:
+        """Async version of get_query_embedding on the native async client (shares its cache)"""
+        key = (self.model, query)
+        embedding, future, owner = self._begin_query_embedding(key)
+        if embedding is not None:
+            return embedding
+        if not owner:
+            # Shielded so cancelling this waiter never cancels the shared request
+            return await asyncio.shield(asyncio.wrap_future(future))
+        
+        try:
+            response = await self.aclient.embeddings.create(
+                input=[query],
+                model=self.model,
+                encoding_format="base64"
+            )
+            embedding = self._decode_embedding(response.data[0])
+        except BaseException as e:
+            self._finish_query_embedding(key, future, error=e)
+            logger.exception("Error getting query embedding")
+            raise
+        self._finish_query_embedding(key, future, embedding)
+        return embedding
@@ -2,49 +2,66 @@
 Gemini LLM Service for keyword extraction
 """
 
-import json
-import asyncio
+import logging
+import re
+from functools import lru_cache
 from typing import List
 
 import google.genai as genai
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Matches a reply wrapped in a markdown code fence (```json ... ``` or ``` ... ```)
+_CODE_FENCE_RE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+
+# Keyword extraction prompt, split around the user query so each call is one concatenation
+_KEYWORD_PROMPT_PREFIX = (
+    "Extract the most important keywords from this query for document search. Focus on:\n"
+    "- Proper nouns (names, software, standards)\n"
+    "- Technical terms and jargon\n"
+    "- Key concepts that define user intention\n"
+    "- Domain-specific terminology\n"
+    "\n"
+    'Query: "'
+)
+_KEYWORD_PROMPT_SUFFIX = (
+    '"\n'
+    "\n"
+    "Return only a JSON list of keywords (truely important ones):\n"
+    '["keyword1", "keyword2", ...]\n'
+    "\n"
+    "Keywords:"
+)
+
+@lru_cache(maxsize=4)
+def _get_genai_client(api_key: str) -> genai.Client:
+    """Shared client per API key, so every GeminiService reuses one warm connection pool"""
+    return genai.Client(api_key=api_key)
 
 class GeminiService:
     def __init__(self, api_key: str, model_name: str = "gemini-2.0-flash"):
-        self.client = genai.Client(api_key=api_key)
+        self.client = _get_genai_client(api_key)
         self.model_name = model_name
     
     async def extract_keywords(self, query: str) -> List[str]:
         """Extract important keywords from query for search optimization"""
-        
-        prompt = f"""
-                Extract the most important keywords from this query for document search. Focus on:
-                - Proper nouns (names, software, standards)
-                - Technical terms and jargon  
-                - Key concepts that define user intention
-                - Domain-specific terminology
-
-                Query: "{query}"
-
-                Return only a JSON list of keywords (truely important ones):
-                ["keyword1", "keyword2", ...]
-
-                Keywords:
-                """
+        prompt = _KEYWORD_PROMPT_PREFIX + query + _KEYWORD_PROMPT_SUFFIX
 
         try:
-            # Use google.genai client API - simple format
-            response = await asyncio.to_thread(
-                self.client.models.generate_content,
+            # Native async client - no worker thread per call
+            response = await self.client.aio.models.generate_content(
                 model=self.model_name,
                 contents=prompt
             )
             
             # Extract JSON from response
             content = response.text.strip()
-            if content.startswith('```json'):
-                content = content.replace('```json', '').replace('```', '').strip()
+            fence_match = _CODE_FENCE_RE.match(content)
+            if fence_match:
+                content = fence_match.group(1)
             
-            keywords = json.loads(content)
+            keywords = orjson.loads(content)
             
             # Validate and filter keywords
             if isinstance(keywords, list):
@@ -54,5 +71,5 @@ class GeminiService:
             return []
             
         except Exception as e:
-            print(f"Gemini keyword extraction error: {e}")
+            logger.error("Gemini keyword extraction error: %s", e)
             return []
\ No newline at end of file
@@ -1,11 +1,38 @@
 # --- MODIFIED FILE: app/core/llms/openai.py ---
 
+import itertools
 import logging
-from typing import List, Dict, Any
-from openai import AsyncOpenAI, RateLimitError, APIError, APITimeoutError
+from typing import List, Dict, Any, Optional
+import httpx
+from openai import NOT_GIVEN, AsyncOpenAI, DefaultAsyncHttpxClient, RateLimitError, APIError, APITimeoutError
+
+from app.core.config.constants import LLMConstants
 
 logger = logging.getLogger(__name__)
 
+# Process-wide HTTP/2 connection pool shared by every OpenAIService instance
+_shared_http_client: Optional[httpx.AsyncClient] = None
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """Get the shared async HTTP client used for OpenAI API calls"""
+    global _shared_http_client
+    if _shared_http_client is None or _shared_http_client.is_closed:
+        _shared_http_client = DefaultAsyncHttpxClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=LLMConstants.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=LLMConstants.HTTP_MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+    return _shared_http_client
+
+async def close_shared_http_client() -> None:
+    """Close the shared HTTP client (call on application shutdown)"""
+    global _shared_http_client
+    if _shared_http_client is not None:
+        await _shared_http_client.aclose()
+        _shared_http_client = None
+
 class OpenAIService:
     """
     Async-first wrapper for OpenAI API calls.
@@ -16,18 +43,22 @@ class OpenAIService:
         model: str,
         timeout: int,
         max_retries: int,
-        max_completion_tokens: int
+        max_completion_tokens: int,
+        http_client: Optional[httpx.AsyncClient] = None
     ):
-        # CHANGED: Use the async client
+        # CHANGED: Use the async client over the shared connection pool unless one is injected.
+        # Retries are the SDK's own (max_retries): exponential backoff on connection errors,
+        # timeouts, 429 and 5xx only, so permanent failures like 400/401 fail fast.
         self.client = AsyncOpenAI(
             api_key=api_key,
             timeout=timeout,
-            max_retries=max_retries
+            max_retries=max_retries,
+            http_client=http_client or get_shared_http_client()
         )
         self.model = model
         self.max_completion_tokens = max_completion_tokens
-        self.request_count = 0
-        self.error_count = 0
+        # next() on itertools.count is atomic, so concurrent calls never lose an update
+        self.reset_statistics()
 
     def create_conversation(
         self,
@@ -41,17 +72,24 @@ class OpenAIService:
         ]
 
     # CHANGED: Converted to async def
-    async def call_llm(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    async def call_llm(
+        self,
+        messages: List[Dict[str, str]],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Asynchronously calls the OpenAI Chat Completions API.
+        timeout overrides the client timeout for this request only; the shared
+        client is never reconfigured, so concurrent calls can't affect each other.
         """
-        self.request_count += 1
+        self._request_count = next(self._request_counter)
         try:
             # CHANGED: Added await for the async client call
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
-                max_completion_tokens=self.max_completion_tokens
+                max_completion_tokens=self.max_completion_tokens,
+                timeout=timeout if timeout is not None else NOT_GIVEN
             )
             
             content = response.choices[0].message.content
@@ -63,15 +101,25 @@ class OpenAIService:
             return {"status": "success", "content": content}
 
         except (RateLimitError, APITimeoutError, APIError) as e:
-            self.error_count += 1
-            logger.error(f"OpenAI API error: {type(e).__name__} - {e}")
+            self._error_count = next(self._error_counter)
+            logger.error("OpenAI API error: %s - %s", type(e).__name__, e)
             return {"status": "error", "error": f"API Error: {str(e)}"}
         except Exception as e:
-            self.error_count += 1
-            logger.error(f"An unexpected error occurred in call_llm: {e}", exc_info=True)
+            self._error_count = next(self._error_counter)
+            logger.error("An unexpected error occurred in call_llm: %s", e, exc_info=True)
             return {"status": "error", "error": f"Unexpected Error: {str(e)}"}
 
+    @property
+    def request_count(self) -> int:
+        return self._request_count
+    
+    @property
+    def error_count(self) -> int:
+        return self._error_count
+
     def reset_statistics(self):
         """Resets request and error counters."""
-        self.request_count = 0
-        self.error_count = 0
\ No newline at end of file
+        self._request_counter = itertools.count(1)
+        self._error_counter = itertools.count(1)
+        self._request_count = 0
+        self._error_count = 0
\ No newline at end of file
@@ -4,6 +4,7 @@ Add simple context to markdown chunks without LLM
 """
 
 import logging
+import time
 from typing import List, Dict, Any
 from dataclasses import dataclass
 
@@ -22,16 +23,16 @@ class ContextualizedChunk:
     
     def to_document(self) -> Dict[str, Any]:
         """Convert to document format for vector storage"""
+        # to_document builds a fresh dict (nothing shared with the chunk), so fill it in place
         doc = self.original_chunk.to_document()
         
         # Use contextualized content if available
         doc['content'] = self.contextualized_content if self.context_added else self.original_chunk.content
         
         # Add contextualization metadata (only essential ones)
-        doc['metadata'].update({
-            'is_contextualized': self.context_added,
-            'context_method': 'simple_injection' if self.context_added else 'none'
-        })
+        metadata = doc['metadata']
+        metadata['is_contextualized'] = self.context_added
+        metadata['context_method'] = 'simple_injection' if self.context_added else 'none'
         
         return doc
 
@@ -57,34 +58,41 @@ class ContextualizationService:
             List of contextualized chunks
         """
         logger.info(f"Starting simple contextualization for {len(chunks)} chunks from {filename}")
+        start_ns = time.perf_counter_ns()
         
-        contextualized_chunks = []
+        # Same for every chunk of the file
+        document_name = filename.removesuffix('.md').replace('_', ' ').title()
+        document_header = f"**Document: {document_name}**"
         
-        for chunk in chunks:
-            contextualized_chunk = self._contextualize_single_chunk(chunk, filename)
-            contextualized_chunks.append(contextualized_chunk)
+        contextualized_chunks: List[ContextualizedChunk] = [None] * len(chunks)
+        success_count = 0
+        for i, chunk in enumerate(chunks):
+            # Short, code and table chunks are passed through without building a header
+            if self.should_contextualize_chunk(chunk):
+                contextualized_chunk = self._contextualize_single_chunk(chunk, document_header)
+            else:
+                contextualized_chunk = ContextualizedChunk(
+                    original_chunk=chunk,
+                    contextualized_content=chunk.content,
+                    context_added=False
+                )
+            contextualized_chunks[i] = contextualized_chunk
+            success_count += contextualized_chunk.context_added
         
-        success_count = sum(1 for c in contextualized_chunks if c.context_added)
-        logger.info(f"Simple contextualization completed: {success_count}/{len(chunks)} chunks contextualized")
+        duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+        logger.info(f"Simple contextualization completed: {success_count}/{len(chunks)} chunks contextualized in {duration_ms}ms")
         
         return contextualized_chunks
     
     def _contextualize_single_chunk(
         self,
         chunk: MarkdownChunk,
-        filename: str
+        document_header: str
     ) -> ContextualizedChunk:
         """Add simple context to a single chunk"""
-        import time
-        
-        start_time = time.time()
-        
-        # Create context header with hierarchy
-        document_name = filename.replace('.md', '').replace('_', ' ').title()
-        
         if self.add_context_header and chunk.header_level > 0:
             # Build hierarchy context
-            context_parts = [f"**Document: {document_name}**"]
+            context_parts = [document_header]
             
             # Add parent headers if available
             parent_headers = chunk.metadata.get('parent_headers', [])
@@ -95,21 +103,17 @@ class ContextualizationService:
             context_parts.append(f"**Current Section: {chunk.header_text}**")
             
             # Combine context header with content
-            context_header = '\n'.join(context_parts) + '\n\n'
-            contextualized_content = context_header + chunk.content
+            contextualized_content = '\n'.join(context_parts) + '\n\n' + chunk.content
             context_added = True
         else:
             # Don't add context header, keep original content
             contextualized_content = chunk.content
             context_added = False
         
-        processing_time = time.time() - start_time
-        
         return ContextualizedChunk(
             original_chunk=chunk,
             contextualized_content=contextualized_content,
-            context_added=context_added,
-            processing_time=processing_time
+            context_added=context_added
         )
     
     def should_contextualize_chunk(self, chunk: MarkdownChunk) -> bool:
@@ -121,10 +125,10 @@ class ContextualizationService:
         if chunk.word_count < RAGConstants.MIN_CONTEXTUALIZATION_WORD_COUNT:
             return False
             
-        # Skip chunks that are mostly code or tables  
-        content_lower = chunk.content.lower()
-        if (content_lower.count('```') >= RAGConstants.CODE_BLOCK_THRESHOLD or 
-            content_lower.count('|') > RAGConstants.TABLE_PIPE_THRESHOLD):
+        # Skip chunks that are mostly code or tables (the `in` checks skip the full count for plain prose)
+        content = chunk.content
+        if ('```' in content and content.count('```') >= RAGConstants.CODE_BLOCK_THRESHOLD) or \
+                ('|' in content and content.count('|') > RAGConstants.TABLE_PIPE_THRESHOLD):
             return False
             
         return True
\ No newline at end of file
@@ -4,18 +4,40 @@ Read and split Markdown into chunks based on header structure
 """
 
 import re
+import pickle
+import hashlib
 import logging
+import aiofiles
+from bisect import bisect_right
+from itertools import accumulate
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
 from ..config.constants import RAGConstants
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# All header forms in one multiline pattern, swept across the whole file at once:
+# ATX headers (# ## ###), numbered sections (**1. ...**) and bold headers (**...**).
+# [^\S\n] is whitespace other than newline, so every match stays within one line.
+_HEADER_LINE_RE = re.compile(
+    r'^[^\S\n]*(?:'
+    r'(?P<hashes>#{1,6})[^\S\n]+(?P<atx>\S.*?)'
+    r'|\*\*(?:(?P<num>\d+\.[^\S\n]*.+?)|(?P<bold>.+?))\*\*'
+    r')[^\S\n]*$',
+    re.MULTILINE
+)
+
+# Parsed chunks are cached next to the source file; bump the version whenever
+# parsing or chunking output changes so stale pickles are ignored
+_CHUNK_CACHE_DIR = Path('.cache') / 'md'
+_CHUNK_CACHE_VERSION = 2
+
+
+@dataclass(slots=True)
 class MarkdownChunk:
-    """Represents a chunk of markdown content"""
+    """Represents a chunk of markdown content (slotted: no per-instance __dict__)"""
     content: str
     header_level: int
     header_text: str
@@ -33,7 +55,7 @@ class MarkdownChunk:
                 'header_level': self.header_level,
                 'header_text': self.header_text,
                 'word_count': self.word_count,
-                'parent_headers': self.metadata.get('parent_headers', [])
+                'parent_headers': list(self.metadata.get('parent_headers', ()))
             }
         }
 
@@ -50,7 +72,7 @@ class MarkdownReader:
         self.max_chunk_size = max_chunk_size
         self.header_merge_threshold = header_merge_threshold
         
-    def read_markdown_file(self, file_path: str) -> List[MarkdownChunk]:
+    async def read_markdown_file(self, file_path: str) -> List[MarkdownChunk]:
         """
         Read markdown file and return intelligent chunks
         
@@ -67,14 +89,27 @@ class MarkdownReader:
             
             logger.info(f"Reading markdown file: {file_path.name}")
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Read without blocking the event loop; parsing below stays synchronous
+            async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
+                content = await f.read()
+            
+            # Skip parsing when this exact content was already chunked with the same parameters
+            cache_path = self._chunk_cache_path(file_path, content)
+            cached_chunks = await self._load_cached_chunks(cache_path)
+            if cached_chunks is not None:
+                logger.info(f"Loaded {len(cached_chunks)} cached chunks for {file_path.name}")
+                return cached_chunks
             
             # Parse markdown into sections
-            sections = self._parse_markdown_sections(content)
+            lines = content.split('\n')
+            line_offsets = list(accumulate((len(line) + 1 for line in lines), initial=0))
+            sections = self._parse_markdown_sections(content, line_offsets)
             
             # Convert to chunks with intelligent splitting
-            chunks = self._create_intelligent_chunks(sections, file_path.name)
+            chunks = self._create_intelligent_chunks(
+                sections, file_path.name, content, lines, line_offsets
+            )
+            await self._store_cached_chunks(cache_path, chunks)
             
             logger.info(f"Created {len(chunks)} chunks from {file_path.name}")
             return chunks
@@ -83,47 +118,77 @@ class MarkdownReader:
             logger.error(f"Error reading markdown file: {e}")
             raise
     
-    def _parse_markdown_sections(self, content: str) -> List[Dict[str, Any]]:
-        """Parse markdown content into hierarchical sections with parent header tracking"""
-        lines = content.split('\n')
+    def _chunk_cache_path(self, file_path: Path, content: str) -> Path:
+        """Cache file for the chunks of this content, file name and chunking parameters"""
+        key = hashlib.sha256(content.encode('utf-8'))
+        key.update(repr((
+            _CHUNK_CACHE_VERSION,
+            file_path.name,
+            self.min_chunk_size,
+            self.max_chunk_size,
+            self.header_merge_threshold
+        )).encode('utf-8'))
+        return file_path.parent / _CHUNK_CACHE_DIR / f"{key.hexdigest()}.pkl"
+    
+    async def _load_cached_chunks(self, cache_path: Path) -> Optional[List[MarkdownChunk]]:
+        """Load cached chunks, or None on a miss or unreadable cache file"""
+        if not cache_path.exists():
+            return None
+        try:
+            async with aiofiles.open(cache_path, 'rb') as f:
+                return pickle.loads(await f.read())
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable chunk cache {cache_path.name}: {e}")
+            return None
+    
+    async def _store_cached_chunks(self, cache_path: Path, chunks: List[MarkdownChunk]) -> None:
+        """Persist chunks to the cache; failures only cost a re-parse next time"""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            async with aiofiles.open(cache_path, 'wb') as f:
+                await f.write(pickle.dumps(chunks, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception as e:
+            logger.warning(f"Failed to write chunk cache {cache_path.name}: {e}")
+    
+    def _parse_markdown_sections(
+        self,
+        content: str,
+        line_offsets: List[int]
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse markdown content into hierarchical sections with parent header tracking.
+        Sections hold line ranges only; content is materialized at chunk creation.
+        """
         sections = []
         current_section = None
         header_stack = []  # Track parent headers for hierarchy
         
-        for line_num, line in enumerate(lines):
-            line_stripped = line.strip()
-            
-            # Check for standard markdown headers (# ## ###)
-            header_match = re.match(r'^(#{1,6})\s+(.+)$', line_stripped)
-            
-            # Check for bold text headers (**text**)
-            bold_header_match = re.match(r'^\*\*(.+?)\*\*\s*$', line_stripped)
-            
-            # Check for questions/numbered sections (1. 2. etc.)
-            numbered_match = re.match(r'^\*\*(\d+\.\s*.+?)\*\*\s*$', line_stripped)
+        # Only header lines are visited; body lines are never looked at individually
+        for header_match in _HEADER_LINE_RE.finditer(content):
+            line_num = bisect_right(line_offsets, header_match.start()) - 1
+            hashes, atx_text, numbered_text, bold_text = header_match.group(
+                'hashes', 'atx', 'num', 'bold'
+            )
             
-            if header_match:
+            if hashes:
                 # Save previous section
                 if current_section:
                     current_section['end_line'] = line_num - 1
-                    current_section['content'] = self._build_section_content_with_hierarchy(
-                        lines, current_section, header_stack
-                    )
                     sections.append(current_section)
                 
                 # Start new section
-                level = len(header_match.group(1))
-                header_text = header_match.group(2).strip()
+                level = len(hashes)
+                header_text = atx_text.strip()
                 
                 # Update header stack - remove headers at same or deeper level
-                header_stack = [h for h in header_stack if h['level'] < level]
+                while header_stack and header_stack[-1]['level'] >= level:
+                    header_stack.pop()
                 
                 # Add current header to stack
                 header_info = {
                     'level': level,
                     'text': header_text,
-                    'line': line_num,
-                    'raw_line': line
+                    'line': line_num
                 }
                 header_stack.append(header_info)
                 
@@ -132,29 +197,26 @@ class MarkdownReader:
                     'header_text': header_text,
                     'start_line': line_num,
                     'end_line': None,
-                    'content': None,
-                    'parent_headers': header_stack.copy()
+                    'parent_headers': tuple(header_stack[:-1]),
+                    'parent_header_texts': [h['text'] for h in header_stack[:-1]]
                 }
-            elif numbered_match and len(numbered_match.group(1).strip()) > 3:
+            elif numbered_text and len(numbered_text.strip()) > 3:
                 # Save previous section
                 if current_section:
                     current_section['end_line'] = line_num - 1
-                    current_section['content'] = self._build_section_content_with_hierarchy(
-                        lines, current_section, header_stack
-                    )
                     sections.append(current_section)
                 
                 # Start new section for numbered questions
-                header_text = numbered_match.group(1).strip()
+                header_text = numbered_text.strip()
                 level = 3  # Treat as H3
                 
                 # Update header stack
-                header_stack = [h for h in header_stack if h['level'] < level]
+                while header_stack and header_stack[-1]['level'] >= level:
+                    header_stack.pop()
                 header_info = {
                     'level': level,
                     'text': header_text,
-                    'line': line_num,
-                    'raw_line': line
+                    'line': line_num
                 }
                 header_stack.append(header_info)
                 
@@ -163,29 +225,26 @@ class MarkdownReader:
                     'header_text': header_text,
                     'start_line': line_num,
                     'end_line': None,
-                    'content': None,
-                    'parent_headers': header_stack.copy()
+                    'parent_headers': tuple(header_stack[:-1]),
+                    'parent_header_texts': [h['text'] for h in header_stack[:-1]]
                 }
-            elif bold_header_match and len(bold_header_match.group(1).strip()) > 3:
+            elif bold_text and len(bold_text.strip()) > 3:
                 # Save previous section  
                 if current_section:
                     current_section['end_line'] = line_num - 1
-                    current_section['content'] = self._build_section_content_with_hierarchy(
-                        lines, current_section, header_stack
-                    )
                     sections.append(current_section)
                 
                 # Start new section for bold headers
-                header_text = bold_header_match.group(1).strip()
+                header_text = bold_text.strip()
                 level = 2  # Treat as H2
                 
                 # Update header stack
-                header_stack = [h for h in header_stack if h['level'] < level]
+                while header_stack and header_stack[-1]['level'] >= level:
+                    header_stack.pop()
                 header_info = {
                     'level': level,
                     'text': header_text,
-                    'line': line_num,
-                    'raw_line': line
+                    'line': line_num
                 }
                 header_stack.append(header_info)
                 
@@ -194,98 +253,104 @@ class MarkdownReader:
                     'header_text': header_text,
                     'start_line': line_num,
                     'end_line': None,
-                    'content': None,
-                    'parent_headers': header_stack.copy()
+                    'parent_headers': tuple(header_stack[:-1]),
+                    'parent_header_texts': [h['text'] for h in header_stack[:-1]]
                 }
         
         # Handle last section
         if current_section:
-            current_section['end_line'] = len(lines) - 1
-            current_section['content'] = self._build_section_content_with_hierarchy(
-                lines, current_section, header_stack
-            )
+            # line_offsets holds one start per line plus the end-of-content sentinel
+            current_section['end_line'] = len(line_offsets) - 2
             sections.append(current_section)
         
         # Handle content without headers (intro content)
         if sections and sections[0]['start_line'] > 0:
-            intro_content = '\n'.join(lines[:sections[0]['start_line']])
-            if intro_content.strip():
+            if content[:line_offsets[sections[0]['start_line']]].strip():
                 intro_section = {
                     'header_level': 0,
                     'header_text': 'Document Introduction',
                     'start_line': 0,
                     'end_line': sections[0]['start_line'] - 1,
-                    'content': intro_content,
-                    'parent_headers': []
+                    'parent_headers': (),
+                    'parent_header_texts': []
                 }
                 sections.insert(0, intro_section)
         
         return sections
     
-    def _build_section_content_with_hierarchy(
+    def _section_lines(self, lines: List[Any], section: Dict[str, Any]) -> List[Any]:
+        """Return section lines (or any per-line values) with parent header lines prepended"""
+        section_lines = [lines[h['line']] for h in section['parent_headers']]
+        section_lines.extend(lines[section['start_line']:section['end_line'] + 1])
+        return section_lines
+    
+    def _section_content(
         self,
+        content: str,
+        line_offsets: List[int],
         lines: List[str],
-        section: Dict[str, Any],
-        header_stack: List[Dict[str, Any]]
+        section: Dict[str, Any]
     ) -> str:
-        """Build section content with parent headers included"""
-        # Get parent headers (exclude current section header)
-        parent_headers = [h for h in header_stack if h['line'] < section['start_line']]
-        
-        # Build content with hierarchy
-        content_parts = []
-        
-        # Add parent headers
-        for header in parent_headers:
-            content_parts.append(header['raw_line'])
-        
-        # Add current section content (including current header)
-        section_content = '\n'.join(
-            lines[section['start_line']:section['end_line'] + 1]
+        """Slice section text straight out of the file content, parent header lines first"""
+        content_parts = [lines[h['line']] for h in section['parent_headers']]
+        content_parts.append(
+            content[line_offsets[section['start_line']]:line_offsets[section['end_line'] + 1] - 1]
         )
-        content_parts.append(section_content)
-        
         return '\n'.join(content_parts)
     
     def _create_intelligent_chunks(
         self, 
         sections: List[Dict[str, Any]], 
-        filename: str
+        filename: str,
+        raw_content: str,
+        lines: List[str],
+        line_offsets: List[int]
     ) -> List[MarkdownChunk]:
         """Create intelligent chunks from sections"""
         chunks = []
         skip_next = False
         
+        def stripped_content(section: Dict[str, Any]) -> str:
+            # Content is only materialized once a chunk is committed
+            return self._section_content(raw_content, line_offsets, lines, section).strip()
+        
+        # Count words once per line; section counts come from prefix sums.
+        # A zero count means the section is blank, so merge decisions need no string work.
+        line_word_counts = [len(line.split()) for line in lines]
+        word_prefix = list(accumulate(line_word_counts, initial=0))
+        section_word_counts = [
+            sum(line_word_counts[h['line']] for h in section['parent_headers'])
+            + word_prefix[section['end_line'] + 1] - word_prefix[section['start_line']]
+            for section in sections
+        ]
+        
         for i, section in enumerate(sections):
             # Skip if this section was already processed as part of merge
             if skip_next:
                 skip_next = False
                 continue
                 
-            content = section['content'].strip()
-            if not content:
+            word_count = section_word_counts[i]
+            if not word_count:
                 continue
             
-            word_count = len(content.split())
-            
             # Create base metadata
             metadata = {
                 'source': filename,
-                'parent_headers': [h['text'] for h in section.get('parent_headers', []) if h['line'] < section['start_line']]
+                'parent_headers': section['parent_header_texts']
             }
             
             # Handle small sections - try to merge with next if possible
             if word_count < self.min_chunk_size and i < len(sections) - 1:
                 next_section = sections[i + 1]
-                next_content = next_section['content'].strip()
-                if next_content:  # Only merge if next section has content
-                    combined_content = content + '\n\n' + next_content
-                    combined_word_count = len(combined_content.split())
+                next_word_count = section_word_counts[i + 1]
+                if next_word_count:  # Only merge if next section has content
+                    combined_word_count = word_count + next_word_count
                     
                     if combined_word_count <= self.max_chunk_size:
                         # Create merged chunk
                         chunk = MarkdownChunk(
-                            content=combined_content,
+                            content=stripped_content(section) + '\n\n' + stripped_content(next_section),
                             header_level=section['header_level'],
                             header_text=f"{section['header_text']} + {next_section['header_text']}",
                             start_line=section['start_line'],
@@ -299,12 +364,14 @@ class MarkdownReader:
             
             # Handle large sections - split if necessary
             if word_count > self.max_chunk_size:
-                sub_chunks = self._split_large_section(section, metadata)
+                sub_chunks = self._split_large_section(
+                    section, metadata, lines, line_word_counts
+                )
                 chunks.extend(sub_chunks)
             else:
                 # Create single chunk
                 chunk = MarkdownChunk(
-                    content=content,
+                    content=stripped_content(section),
                     header_level=section['header_level'],
                     header_text=section['header_text'],
                     start_line=section['start_line'],
@@ -319,53 +386,35 @@ class MarkdownReader:
     def _split_large_section(
         self, 
         section: Dict[str, Any], 
-        base_metadata: Dict[str, Any]
+        base_metadata: Dict[str, Any],
+        lines: List[str],
+        line_word_counts: List[int]
     ) -> List[MarkdownChunk]:
-        """Split large sections into smaller chunks"""
-        content = section['content']
-        lines = content.split('\n')
+        """
+        Split large sections into smaller chunks. Each chunk greedily takes as many
+        lines as fit in max_chunk_size words (at least one), found by bisecting the
+        section's word-count prefix sums.
+        """
+        section_lines = self._section_lines(lines, section)
+        word_prefix = list(accumulate(self._section_lines(line_word_counts, section), initial=0))
         
         chunks = []
-        current_chunk_lines = []
-        current_word_count = 0
-        
-        for line in lines:
-            line_word_count = len(line.split())
-            
-            # Check if adding this line would exceed max size
-            if current_word_count + line_word_count > self.max_chunk_size and current_chunk_lines:
-                # Create chunk from accumulated lines
-                chunk_content = '\n'.join(current_chunk_lines)
-                chunk = MarkdownChunk(
-                    content=chunk_content,
-                    header_level=section['header_level'],
-                    header_text=f"{section['header_text']} (Part {len(chunks) + 1})",
-                    start_line=section['start_line'],
-                    end_line=section['end_line'],
-                    word_count=current_word_count,
-                    metadata=base_metadata
-                )
-                chunks.append(chunk)
-                
-                # Start new chunk
-                current_chunk_lines = [line]
-                current_word_count = line_word_count
-            else:
-                current_chunk_lines.append(line)
-                current_word_count += line_word_count
-        
-        # Handle remaining lines
-        if current_chunk_lines:
-            chunk_content = '\n'.join(current_chunk_lines)
+        start = 0
+        while start < len(section_lines):
+            end = max(
+                bisect_right(word_prefix, word_prefix[start] + self.max_chunk_size) - 1,
+                start + 1
+            )
             chunk = MarkdownChunk(
-                content=chunk_content,
+                content='\n'.join(section_lines[start:end]),
                 header_level=section['header_level'],
                 header_text=f"{section['header_text']} (Part {len(chunks) + 1})",
                 start_line=section['start_line'],
                 end_line=section['end_line'],
-                word_count=current_word_count,
+                word_count=word_prefix[end] - word_prefix[start],
                 metadata=base_metadata
             )
             chunks.append(chunk)
+            start = end
         
-        return chunks
\ No newline at end of file
+        return chunks
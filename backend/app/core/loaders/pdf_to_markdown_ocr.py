@@ -3,11 +3,16 @@ Enhanced PDF to Markdown OCR Processor
 Using Google GenAI multimodal LLM with chunk-based processing to convert PDF to Markdown
 """
 
+import io
+import re
+import time
+import random
+import hashlib
 import logging
 import asyncio
 import aiofiles
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Union
 
 from app.core.config.settings import get_settings
 from app.core.config.constants import RAGConstants
@@ -57,6 +62,47 @@ You are **FirstChunkOCR-Bot**, specialized in processing the first part of PDF d
 - Pay special attention to technical symbols (φ, γ, σ, τ, etc.)
 """
 
+OCR_CHUNK_BATCH_SYSTEM_PROMPT = OCR_CHUNK_SYSTEM_PROMPT + """
+## IV. Multiple Chunks
+
+- You will receive several chunks, each preceded by a marker like `<<<CHUNK_1>>>`
+- Convert every chunk **separately and in order**
+- Start the output of each chunk with its marker **exactly as given**, on its own line
+- **DO NOT** merge, skip or reorder chunks
+"""
+
+# Splits a batched OCR response on its chunk markers, capturing the chunk numbers
+_CHUNK_MARKER_RE = re.compile(r'<<<CHUNK_(\d+)>>>')
+
+# OCR markdown is cached next to the source PDF, keyed by content fingerprint
+_OCR_CACHE_DIR = Path('.cache') / 'ocr'
+_FINGERPRINT_READ_SIZE = 1 << 20  # 1 MiB reads keep hashing memory flat for large PDFs
+
+
+def _is_retryable_ocr_error(error: Exception) -> bool:
+    """
+    Whether an OCR request failure is worth retrying. Client errors other than
+    rate limiting (bad request, auth, not found) can never succeed, so they fail fast;
+    429s, server errors and transport errors are retried.
+    """
+    from google.genai import errors as genai_errors
+    
+    if isinstance(error, genai_errors.ClientError):
+        return error.code == 429
+    return True
+
+
+def _ocr_backoff_delay(attempt: int) -> float:
+    """
+    Full-jitter exponential backoff: a uniform draw up to base * 2**attempt (capped),
+    so chunks throttled together do not retry in lockstep
+    """
+    ceiling = min(
+        RAGConstants.OCR_BACKOFF_BASE_SECONDS * 2 ** attempt,
+        RAGConstants.OCR_BACKOFF_MAX_SECONDS
+    )
+    return random.uniform(0, ceiling)
+
 
 class PDFToMarkdownOCR:
     """Enhanced PDF to Markdown OCR processor with chunk-based processing"""
@@ -69,9 +115,18 @@ class PDFToMarkdownOCR:
             max_pages_per_chunk: Maximum pages per processing chunk (default: 5)
         """
         self.settings = get_settings()
+        # Request parameters read on every OCR attempt, resolved once
+        self._model = self.settings.GOOGLE_GENAI_MODEL_VISION
+        self._max_output_tokens = RAGConstants.OCR_MAX_OUTPUT_TOKENS
+        self._temperature = RAGConstants.OCR_TEMPERATURE
+        self._max_retries = RAGConstants.OCR_MAX_RETRIES
         self.max_pages_per_chunk = max_pages_per_chunk
         self.pdf_splitter = PDFPageSplitter(max_pages_per_chunk)
         self.markdown_assembler = MarkdownAssembler()
+        # Bounds concurrent chunk OCR requests to stay within API rate limits
+        self._ocr_semaphore = asyncio.Semaphore(RAGConstants.OCR_MAX_CONCURRENCY)
+        # Uploaded file handles keyed by content SHA-256 -> (handle, upload time)
+        self._uploaded_files: Dict[str, Tuple[Any, float]] = {}
         self._initialize_client()
     
     def _initialize_client(self):
@@ -80,12 +135,26 @@ class PDFToMarkdownOCR:
             from google import genai
             
             self.client = genai.Client(api_key=self.settings.GOOGLE_GENAI_API_KEY)
+            # Request configs are identical across chunks and retries, so build them once
+            self._first_chunk_config = self._build_ocr_config(OCR_FIRST_CHUNK_SYSTEM_PROMPT)
+            self._chunk_config = self._build_ocr_config(OCR_CHUNK_SYSTEM_PROMPT)
+            self._chunk_batch_config = self._build_ocr_config(OCR_CHUNK_BATCH_SYSTEM_PROMPT)
             logger.info("Google GenAI client initialized for chunked OCR processing")
             
         except Exception as e:
             logger.error(f"Failed to initialize Google GenAI client: {e}")
             raise
     
+    def _build_ocr_config(self, system_prompt: str) -> Any:
+        """Generation config for OCR requests with the given system prompt"""
+        from google.genai import types
+        
+        return types.GenerateContentConfig(
+            system_instruction=system_prompt,
+            max_output_tokens=self._max_output_tokens,
+            temperature=self._temperature
+        )
+    
     async def convert_pdf_to_markdown(
         self, 
         pdf_path: str,
@@ -116,15 +185,24 @@ class PDFToMarkdownOCR:
             
             logger.info(f"PDF Info: {pdf_info['total_pages']} pages, chunking: {should_chunk}")
             
-            if should_chunk:
-                # Step 2a: Chunked processing for large PDFs
-                markdown_content = await self._ocr_pdf_with_chunks(str(pdf_path), pdf_info)
-            else:
-                # Step 2b: Single-pass processing for small PDFs
-                markdown_content = await self._ocr_pdf_single_pass(str(pdf_path))
+            # Skip OCR when an identical PDF was already converted with the same settings
+            cache_path = await self._ocr_cache_path(pdf_path, should_chunk)
+            markdown_content = await self._load_cached_markdown(cache_path)
             
-            if not markdown_content:
-                raise ValueError("Failed to extract content from PDF")
+            if markdown_content is not None:
+                logger.info(f"Using cached OCR markdown for {pdf_path.name}")
+            else:
+                if should_chunk:
+                    # Step 2a: Chunked processing for large PDFs
+                    markdown_content = await self._ocr_pdf_with_chunks(str(pdf_path), pdf_info)
+                else:
+                    # Step 2b: Single-pass processing for small PDFs
+                    markdown_content = await self._ocr_pdf_single_pass(str(pdf_path))
+                
+                if not markdown_content:
+                    raise ValueError("Failed to extract content from PDF")
+                
+                await self._store_cached_markdown(cache_path, markdown_content)
             
             # Step 3: Save markdown file
             if output_dir is None:
@@ -143,6 +221,35 @@ class PDFToMarkdownOCR:
             logger.error(f"Error in enhanced PDF to Markdown conversion: {e}")
             raise
     
+    async def _ocr_cache_path(self, pdf_path: Path, should_chunk: bool) -> Path:
+        """Cache file for the OCR output of this PDF content under the current OCR settings"""
+        fingerprint = hashlib.blake2b(digest_size=16)
+        async with aiofiles.open(pdf_path, 'rb') as f:
+            while block := await f.read(_FINGERPRINT_READ_SIZE):
+                fingerprint.update(block)
+        fingerprint.update(repr((self._model, should_chunk, self.max_pages_per_chunk)).encode('utf-8'))
+        return pdf_path.parent / _OCR_CACHE_DIR / f"{fingerprint.hexdigest()}.md"
+    
+    async def _load_cached_markdown(self, cache_path: Path) -> Optional[str]:
+        """Load cached OCR markdown, or None on a miss or unreadable cache file"""
+        if not cache_path.exists():
+            return None
+        try:
+            async with aiofiles.open(cache_path, 'r', encoding='utf-8') as f:
+                return await f.read()
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable OCR cache {cache_path.name}: {e}")
+            return None
+    
+    async def _store_cached_markdown(self, cache_path: Path, content: str) -> None:
+        """Persist OCR markdown to the cache; failures only cost a re-OCR next time"""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            async with aiofiles.open(cache_path, 'w', encoding='utf-8') as f:
+                await f.write(content)
+        except Exception as e:
+            logger.warning(f"Failed to write OCR cache {cache_path.name}: {e}")
+    
     def _should_use_chunking(self, pdf_info: dict, force_chunking: bool = None) -> bool:
         """
         Determine if chunking should be used based on PDF characteristics
@@ -166,51 +273,43 @@ class PDFToMarkdownOCR:
         try:
             logger.info(f"Starting chunked OCR processing for {pdf_info['total_pages']} pages")
             
-            # Step 1: Split PDF into chunks
-            chunks = self.pdf_splitter.split_pdf_to_chunks(pdf_path)
+            # Step 1: Split PDF into chunks (CPU-bound PyMuPDF work, kept off the event loop
+            # so other conversions keep issuing OCR requests meanwhile)
+            chunks = await asyncio.to_thread(self.pdf_splitter.split_pdf_to_chunks, pdf_path)
             logger.info(f"Split PDF into {len(chunks)} chunks")
             
-            # Step 2: Process each chunk
-            processed_chunks = []
+            # Step 2: Process chunk groups concurrently; gather preserves chunk order
+            # (the first chunk needs title and TOC, so it is always sent alone)
+            group_results = await asyncio.gather(
+                *(self._ocr_chunk_group(chunks, group) for group in self._group_chunks(chunks))
+            )
+            results = [result for group_result in group_results for result in group_result]
             
-            for i, (chunk_path, start_page, end_page) in enumerate(chunks):
-                try:
-                    logger.info(f"Processing chunk {i+1}/{len(chunks)}: pages {start_page}-{end_page}")
-                    
-                    # Determine if this is the first chunk (needs title and TOC)
-                    is_first_chunk = (i == 0)
-                    
-                    # OCR the chunk
-                    chunk_content = await self._ocr_single_chunk(
-                        chunk_path, 
-                        is_first_chunk=is_first_chunk
-                    )
-                    
-                    if chunk_content:
-                        processed_chunks.append({
-                            'content': chunk_content,
-                            'start_page': start_page,
-                            'end_page': end_page,
-                            'chunk_index': i,
-                            'is_first_chunk': is_first_chunk
-                        })
-                        logger.info(f"✅ Successfully processed chunk {i+1}")
-                    else:
-                        logger.warning(f"⚠️ Empty content from chunk {i+1}")
-                        
-                except Exception as e:
-                    logger.error(f"❌ Failed to process chunk {i+1}: {e}")
+            processed_chunks = []
+            for i, ((_, start_page, end_page), chunk_content) in enumerate(zip(chunks, results)):
+                if isinstance(chunk_content, asyncio.CancelledError):
+                    raise chunk_content
+                if isinstance(chunk_content, BaseException):
+                    logger.error(f"❌ Failed to process chunk {i+1}: {chunk_content}")
                     # Continue with other chunks instead of failing completely
                     continue
-            
-            # Step 3: Clean up temporary files
-            chunk_paths = [chunk[0] for chunk in chunks]
-            self.pdf_splitter.cleanup_temp_files(chunk_paths)
+                
+                if chunk_content:
+                    processed_chunks.append({
+                        'content': chunk_content,
+                        'start_page': start_page,
+                        'end_page': end_page,
+                        'chunk_index': i,
+                        'is_first_chunk': i == 0
+                    })
+                    logger.info(f"✅ Successfully processed chunk {i+1}")
+                else:
+                    logger.warning(f"⚠️ Empty content from chunk {i+1}")
             
             if not processed_chunks:
                 raise ValueError("No chunks were successfully processed")
             
-            # Step 4: Assemble chunks into final document
+            # Step 3: Assemble chunks into final document
             pdf_name = Path(pdf_path).stem
             final_content = self.markdown_assembler.assemble_chunks(
                 processed_chunks,
@@ -229,82 +328,219 @@ class PDFToMarkdownOCR:
         try:
             logger.info("Using single-pass OCR processing")
             
-            from google import genai
-            from google.genai import types
-            
             # Upload PDF file to Google GenAI
-            uploaded_file = self.client.files.upload(file=pdf_path)
+            uploaded_file = await self._upload_file(pdf_path)
             
             # Generate markdown content using multimodal model
-            for attempt in range(1, RAGConstants.OCR_MAX_RETRIES + 1):
+            for attempt in range(1, self._max_retries + 1):
                 try:
                     if attempt > 1:
                         logger.info(f"Retry OCR attempt {attempt}")
                         
-                    response = await asyncio.to_thread(
-                        self.client.models.generate_content,
-                        model=self.settings.GOOGLE_GENAI_MODEL_VISION,
+                    response = await self.client.aio.models.generate_content(
+                        model=self._model,
                         contents=[uploaded_file],
-                        config=types.GenerateContentConfig(
-                            system_instruction=OCR_FIRST_CHUNK_SYSTEM_PROMPT,  # Use first chunk prompt for complete processing
-                            max_output_tokens=RAGConstants.OCR_MAX_OUTPUT_TOKENS,
-                            temperature=RAGConstants.OCR_TEMPERATURE
-                        )
+                        config=self._first_chunk_config  # Use first chunk prompt for complete processing
                     )
                     
                     return response.text
                     
                 except Exception as e:
                     logger.error(f"Single-pass OCR attempt {attempt} failed: {e}")
-                    if attempt == RAGConstants.OCR_MAX_RETRIES:
+                    if attempt == self._max_retries or not _is_retryable_ocr_error(e):
                         raise
-                    await asyncio.sleep(attempt ** 2)
+                    await asyncio.sleep(_ocr_backoff_delay(attempt))
                     
         except Exception as e:
             logger.error(f"Error in single-pass OCR: {e}")
             raise
     
-    async def _ocr_single_chunk(self, chunk_path: str, is_first_chunk: bool = False) -> str:
-        """OCR a single chunk file"""
+    def _group_chunks(self, chunks: List[Tuple[bytes, int, int]]) -> List[List[int]]:
+        """
+        Group chunk indices for OCR requests. The first chunk stays alone; following
+        chunks are batched while the estimated output fits one response.
+        """
+        if not chunks:
+            return []
+        
+        groups = [[0]]
+        current_group = []
+        current_pages = 0
+        for i, (_, start_page, end_page) in enumerate(chunks[1:], start=1):
+            pages = end_page - start_page + 1
+            estimated_tokens = (current_pages + pages) * RAGConstants.OCR_ESTIMATED_TOKENS_PER_PAGE
+            if current_group and (
+                len(current_group) == RAGConstants.OCR_CHUNK_BATCH_SIZE
+                or estimated_tokens > RAGConstants.OCR_MAX_OUTPUT_TOKENS
+            ):
+                groups.append(current_group)
+                current_group = []
+                current_pages = 0
+            current_group.append(i)
+            current_pages += pages
+        
+        if current_group:
+            groups.append(current_group)
+        return groups
+    
+    async def _ocr_chunk_group(
+        self,
+        chunks: List[Tuple[bytes, int, int]],
+        group: List[int]
+    ) -> List[Union[str, BaseException]]:
+        """
+        OCR a group of chunks, returning one content string or exception per chunk
+        (a cancelled chunk comes back as its CancelledError).
+        Batches fall back to per-chunk requests if the batched call fails.
+        """
+        if len(group) > 1:
+            async with self._ocr_semaphore:
+                logger.info(
+                    f"Processing chunks {group[0]+1}-{group[-1]+1}/{len(chunks)} in one request: "
+                    f"pages {chunks[group[0]][1]}-{chunks[group[-1]][2]}"
+                )
+                try:
+                    return await self._ocr_chunk_batch([chunks[i][0] for i in group])
+                except Exception as e:
+                    logger.warning(
+                        f"Batched OCR failed for chunks {group[0]+1}-{group[-1]+1}, "
+                        f"processing individually: {e}"
+                    )
+        
+        return await asyncio.gather(
+            *(
+                self._ocr_chunk_guarded(chunks[i][0], i, len(chunks), chunks[i][1], chunks[i][2])
+                for i in group
+            ),
+            return_exceptions=True
+        )
+    
+    async def _ocr_chunk_guarded(
+        self,
+        chunk_pdf: bytes,
+        chunk_index: int,
+        total_chunks: int,
+        start_page: int,
+        end_page: int
+    ) -> str:
+        """OCR one chunk while holding a slot of the concurrency semaphore"""
+        async with self._ocr_semaphore:
+            logger.info(f"Processing chunk {chunk_index+1}/{total_chunks}: pages {start_page}-{end_page}")
+            return await self._ocr_single_chunk(chunk_pdf, is_first_chunk=(chunk_index == 0))
+    
+    async def _ocr_single_chunk(self, chunk_pdf: bytes, is_first_chunk: bool = False) -> str:
+        """OCR a single in-memory chunk PDF"""
         try:
-            from google import genai
-            from google.genai import types
-            
-            # Select appropriate system prompt
-            system_prompt = OCR_FIRST_CHUNK_SYSTEM_PROMPT if is_first_chunk else OCR_CHUNK_SYSTEM_PROMPT
+            # Select appropriate system prompt config
+            config = self._first_chunk_config if is_first_chunk else self._chunk_config
             
-            # Upload chunk file
-            uploaded_file = self.client.files.upload(file=chunk_path)
+            # Upload chunk bytes directly, no temp file round trip
+            uploaded_file = await self._upload_file(chunk_pdf)
             
             # Process with retry logic
-            for attempt in range(1, RAGConstants.OCR_MAX_RETRIES + 1):
+            for attempt in range(1, self._max_retries + 1):
                 try:
                     if attempt > 1:
                         logger.debug(f"Retry chunk OCR attempt {attempt}")
                         
-                    response = await asyncio.to_thread(
-                        self.client.models.generate_content,
-                        model=self.settings.GOOGLE_GENAI_MODEL_VISION,
+                    response = await self.client.aio.models.generate_content(
+                        model=self._model,
                         contents=[uploaded_file],
-                        config=types.GenerateContentConfig(
-                            system_instruction=system_prompt,
-                            max_output_tokens=RAGConstants.OCR_MAX_OUTPUT_TOKENS,
-                            temperature=RAGConstants.OCR_TEMPERATURE
-                        )
+                        config=config
                     )
                     
                     return response.text
                     
                 except Exception as e:
                     logger.error(f"Chunk OCR attempt {attempt} failed: {e}")
-                    if attempt == RAGConstants.OCR_MAX_RETRIES:
+                    if attempt == self._max_retries or not _is_retryable_ocr_error(e):
                         raise
-                    await asyncio.sleep(attempt ** 2)
+                    await asyncio.sleep(_ocr_backoff_delay(attempt))
                     
         except Exception as e:
-            logger.error(f"Error processing chunk {chunk_path}: {e}")
+            logger.error(f"Error processing chunk: {e}")
             raise
     
+    async def _ocr_chunk_batch(self, chunk_pdfs: List[bytes]) -> List[str]:
+        """OCR several non-first chunks in one request, split on the chunk markers"""
+        from google.genai import types
+        
+        uploaded_files = await asyncio.gather(*(self._upload_file(pdf) for pdf in chunk_pdfs))
+        contents = []
+        for n, uploaded_file in enumerate(uploaded_files, start=1):
+            contents.append(f"<<<CHUNK_{n}>>>")
+            contents.append(uploaded_file)
+        
+        for attempt in range(1, self._max_retries + 1):
+            try:
+                if attempt > 1:
+                    logger.debug(f"Retry batched chunk OCR attempt {attempt}")
+                    
+                response = await self.client.aio.models.generate_content(
+                    model=self._model,
+                    contents=contents,
+                    config=self._chunk_batch_config
+                )
+                break
+                
+            except Exception as e:
+                logger.error(f"Batched chunk OCR attempt {attempt} failed: {e}")
+                if attempt == self._max_retries or not _is_retryable_ocr_error(e):
+                    raise
+                await asyncio.sleep(_ocr_backoff_delay(attempt))
+        
+        # A truncated reply can still carry every marker while the last chunk's tail is
+        # missing, so treat it like a marker mismatch and let the caller go per chunk
+        finish_reason = response.candidates[0].finish_reason if response.candidates else None
+        if finish_reason == types.FinishReason.MAX_TOKENS:
+            raise ValueError(
+                f"Batched OCR response for {len(chunk_pdfs)} chunks hit max_output_tokens"
+            )
+        
+        # re.split yields [preamble, '1', body1, '2', body2, ...]
+        parts = _CHUNK_MARKER_RE.split(response.text or "")
+        numbers = [int(n) for n in parts[1::2]]
+        if numbers != list(range(1, len(chunk_pdfs) + 1)):
+            raise ValueError(
+                f"Expected markers for {len(chunk_pdfs)} chunks in batched OCR response, got {numbers}"
+            )
+        return [body.strip() for body in parts[2::2]]
+    
+    async def _upload_file(self, source: Union[str, bytes]) -> Any:
+        """
+        Upload a PDF (file path or in-memory bytes) to Google GenAI, reusing the
+        handle of an earlier upload with identical content while it is still
+        within the file TTL
+        """
+        from google.genai import types
+        
+        if isinstance(source, bytes):
+            digest = hashlib.sha256(source).hexdigest()
+        else:
+            digest = await asyncio.to_thread(self._file_digest, source)
+        
+        cached = self._uploaded_files.get(digest)
+        if cached and time.monotonic() - cached[1] < RAGConstants.OCR_UPLOAD_TTL_SECONDS:
+            logger.debug(f"Reusing uploaded file {digest[:12]}")
+            return cached[0]
+        
+        # Native async upload so concurrent chunks overlap on the event loop
+        if isinstance(source, bytes):
+            uploaded_file = await self.client.aio.files.upload(
+                file=io.BytesIO(source),
+                config=types.UploadFileConfig(mime_type='application/pdf')
+            )
+        else:
+            uploaded_file = await self.client.aio.files.upload(file=source)
+        self._uploaded_files[digest] = (uploaded_file, time.monotonic())
+        return uploaded_file
+    
+    @staticmethod
+    def _file_digest(file_path: str) -> str:
+        """SHA-256 hex digest of a file, streamed from disk"""
+        with open(file_path, 'rb') as f:
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+    
     async def _save_markdown_content(
         self, 
         content: str, 
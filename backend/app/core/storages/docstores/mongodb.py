@@ -3,15 +3,80 @@ Simple MongoDB Document Store for Keyword Search
 Simplified version based on HG ChatBot pattern
 """
 
+import uuid
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional, Union
-from pymongo import MongoClient, TEXT, ASCENDING
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Union
+from pymongo import MongoClient, IndexModel, UpdateOne, TEXT, ASCENDING, WriteConcern
 from pymongo.collection import Collection
 from pymongo.database import Database
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+
+from app.core.config.constants import DatabaseConstants
 
 logger = logging.getLogger(__name__)
 
+# Text search results only need these fields; skipping _id and anything else
+# stored on the document cuts BSON decoding and wire bytes
+_TEXT_SEARCH_PROJECTION = {
+    "_id": 0,
+    "doc_id": 1,
+    "content": 1,
+    "metadata": 1,
+    "score": {"$meta": "textScore"}
+}
+
+# Ingestion is re-runnable, so writes are acknowledged without waiting on the journal
+_INGEST_WRITE_CONCERN = WriteConcern(w=1, j=False)
+
+# Shared pooled clients per (host, port), closed once on application shutdown
+_shared_mongo_clients: Dict[Tuple[str, int], MongoClient] = {}
+_shared_mongo_clients_lock = threading.Lock()
+
+def _create_mongo_client(host: str, port: int) -> MongoClient:
+    """Pooled client for one server; connect=False defers the background connect to first use"""
+    return MongoClient(
+        f"mongodb://{host}:{port}/",
+        maxPoolSize=DatabaseConstants.MONGODB_MAX_POOL_SIZE,
+        minPoolSize=DatabaseConstants.MONGODB_MIN_POOL_SIZE,
+        connect=False,
+        serverSelectionTimeoutMS=DatabaseConstants.MONGODB_TIMEOUT_MS,
+        connectTimeoutMS=DatabaseConstants.MONGODB_TIMEOUT_MS,
+        socketTimeoutMS=DatabaseConstants.MONGODB_TIMEOUT_MS
+    )
+
+def _get_mongo_client(host: str, port: int) -> MongoClient:
+    """
+    Shared pooled client per (host, port), so every MongoDocumentStore reuses one
+    connection pool. Stores never close it; see close_shared_mongo_clients.
+    """
+    with _shared_mongo_clients_lock:
+        client = _shared_mongo_clients.get((host, port))
+        if client is None:
+            client = _create_mongo_client(host, port)
+            _shared_mongo_clients[(host, port)] = client
+        return client
+
+def close_shared_mongo_clients() -> None:
+    """Close the shared MongoDB clients (call on application shutdown)"""
+    with _shared_mongo_clients_lock:
+        for client in _shared_mongo_clients.values():
+            client.close()
+        _shared_mongo_clients.clear()
+
+def _create_async_mongo_client(host: str, port: int) -> AsyncIOMotorClient:
+    """Motor client for queries awaited on the event loop"""
+    return AsyncIOMotorClient(
+        f"mongodb://{host}:{port}/",
+        maxPoolSize=DatabaseConstants.MONGODB_MAX_POOL_SIZE,
+        minPoolSize=DatabaseConstants.MONGODB_MIN_POOL_SIZE,
+        serverSelectionTimeoutMS=DatabaseConstants.MONGODB_TIMEOUT_MS,
+        connectTimeoutMS=DatabaseConstants.MONGODB_TIMEOUT_MS,
+        socketTimeoutMS=DatabaseConstants.MONGODB_TIMEOUT_MS
+    )
+
 class MongoConnectionError(Exception):
     """Custom exception for MongoDB connection issues"""
     pass
@@ -39,15 +104,16 @@ class MongoDocumentStore:
         self.host = host
         self.port = port
         
-        # Initialize MongoDB client
-        self.client = MongoClient(
-            self.connection_string,
-            serverSelectionTimeoutMS=5000,  # 5 second timeout
-            connectTimeoutMS=5000,
-            socketTimeoutMS=5000
-        )
+        # Reuse the pooled MongoDB client for this server
+        self.client = _get_mongo_client(host, port)
+        # Only a client created by _reconnect belongs to this store and may be closed by it
+        self._owns_client = False
         self.db: Database = self.client[database_name]
         self.collection: Collection = self.db[collection_name]
+        # Motor client owned by this store and bound to the loop that created it
+        self._async_client: Optional[AsyncIOMotorClient] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_collection: Optional[AsyncIOMotorCollection] = None
         
         # Validate connection immediately
         self._validate_connection()
@@ -55,7 +121,7 @@ class MongoDocumentStore:
         # Initialize indexes
         self._init_indexes()
         
-        logger.info(f"MongoDB DocumentStore initialized successfully: {database_name}.{collection_name}")
+        logger.info("MongoDB DocumentStore initialized successfully: %s.%s", database_name, collection_name)
     
     def _validate_connection(self):
         """Test MongoDB connection and collection availability"""
@@ -67,11 +133,11 @@ class MongoDocumentStore:
             # Test database access
             db_names = self.client.list_database_names()
             if self.database_name not in db_names:
-                logger.warning(f"Database '{self.database_name}' not found. Available: {db_names}")
+                logger.warning("Database '%s' not found. Available: %s", self.database_name, db_names)
             
             # Test collection access
             doc_count = self.collection.count_documents({}, limit=1)
-            logger.debug(f"MongoDB collection '{self.collection_name}' accessible with {doc_count} documents")
+            logger.debug("MongoDB collection '%s' accessible with %s documents", self.collection_name, doc_count)
             
         except ConnectionFailure as e:
             raise MongoConnectionError(f"MongoDB connection failed: {e}")
@@ -108,17 +174,15 @@ class MongoDocumentStore:
         try:
             logger.info("Attempting to reconnect to MongoDB...")
             
-            # Close existing connection
-            if hasattr(self, 'client'):
+            # Close the existing connection only if this store owns it; the shared
+            # client stays open for the other stores using it
+            if self._owns_client:
                 self.client.close()
+            self._close_async_client()
             
-            # Create new connection
-            self.client = MongoClient(
-                self.connection_string,
-                serverSelectionTimeoutMS=5000,
-                connectTimeoutMS=5000,
-                socketTimeoutMS=5000
-            )
+            # Create a new connection for this store only
+            self.client = _create_mongo_client(self.host, self.port)
+            self._owns_client = True
             self.db = self.client[self.database_name]
             self.collection = self.db[self.collection_name]
             
@@ -127,38 +191,65 @@ class MongoDocumentStore:
             logger.info("MongoDB reconnection successful")
             
         except Exception as e:
-            logger.error(f"MongoDB reconnection failed: {e}")
+            logger.error("MongoDB reconnection failed: %s", e)
             raise MongoConnectionError(f"Failed to reconnect to MongoDB: {e}")
 
+    @property
+    def async_collection(self) -> AsyncIOMotorCollection:
+        """
+        Motor collection for async queries, created on first use. A Motor client is
+        tied to the event loop it first ran on, so a different running loop (a second
+        asyncio.run, tests, reload) gets a fresh client.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._close_async_client()
+            self._async_client = _create_async_mongo_client(self.host, self.port)
+            self._async_client_loop = loop
+            self._async_collection = self._async_client[self.database_name][self.collection_name]
+        return self._async_collection
+    
+    def _close_async_client(self):
+        """Close this store's Motor client, if one was created"""
+        if self._async_client is not None:
+            self._async_client.close()
+            self._async_client = None
+            self._async_client_loop = None
+            self._async_collection = None
+    
     def _init_indexes(self):
-        """Initialize MongoDB indexes for text search"""
-        existing_indexes = list(self.collection.list_indexes())
-        index_names = [idx["name"] for idx in existing_indexes]
-        
-        # Text search index for content
-        if "text_search_idx" not in index_names:
-            self.collection.create_index(
-                [("content", TEXT)],
-                name="text_search_idx"
-            )
-            logger.info("Created text search index")
-        
-        # Document ID index
-        if "doc_id_idx" not in index_names:
-            self.collection.create_index(
-                [("doc_id", ASCENDING)],
-                name="doc_id_idx",
-                unique=True
-            )
-            logger.info("Created document ID index")
-        
-        # Source file index
-        if "source_idx" not in index_names:
-            self.collection.create_index(
-                [("metadata.source", ASCENDING)],
-                name="source_idx"
-            )
-            logger.info("Created source file index")
+        """
+        Initialize MongoDB indexes for text search in one createIndexes round trip.
+        Indexes that already exist with the same name and spec are left untouched.
+        """
+        index_names = self.collection.create_indexes([
+            # Text search index for content
+            IndexModel([("content", TEXT)], name="text_search_idx"),
+            # Document ID index
+            IndexModel([("doc_id", ASCENDING)], name="doc_id_idx", unique=True),
+            # Source file index
+            IndexModel([("metadata.source", ASCENDING)], name="source_idx")
+        ])
+        logger.info("Ensured MongoDB indexes: %s", index_names)
+    
+    def _build_upsert_ops(self, documents: List[Dict[str, Any]]) -> List[UpdateOne]:
+        """Build one doc_id-keyed upsert per document, assigning missing doc_ids"""
+        bulk_ops = []
+        for doc in documents:
+            doc_id = doc.get('doc_id')
+            if not doc_id:
+                # Generate doc_id if not provided
+                doc_id = str(uuid.uuid4())
+                doc['doc_id'] = doc_id
+            
+            # Prepare document for MongoDB
+            mongo_doc = {
+                "doc_id": doc_id,
+                "content": doc['content'],
+                "metadata": doc.get('metadata', {})
+            }
+            bulk_ops.append(UpdateOne({"doc_id": doc_id}, {"$set": mongo_doc}, upsert=True))
+        return bulk_ops
     
     def add_documents(self, documents: List[Dict[str, Any]]) -> None:
         """
@@ -175,37 +266,37 @@ class MongoDocumentStore:
         if not documents:
             return
         
-        operations = []
-        for doc in documents:
-            doc_id = doc.get('doc_id')
-            if not doc_id:
-                # Generate doc_id if not provided
-                import uuid
-                doc_id = str(uuid.uuid4())
-                doc['doc_id'] = doc_id
-            
-            # Prepare document for MongoDB
-            mongo_doc = {
-                "doc_id": doc_id,
-                "content": doc['content'],
-                "metadata": doc.get('metadata', {})
-            }
-            
-            operations.append({
-                "filter": {"doc_id": doc_id},
-                "update": {"$set": mongo_doc},
-                "upsert": True
-            })
+        bulk_ops = self._build_upsert_ops(documents)
         
-        # Use bulk write for efficiency
-        from pymongo import UpdateOne
-        bulk_ops = [
-            UpdateOne(op["filter"], op["update"], upsert=op["upsert"])
-            for op in operations
-        ]
+        # Send bounded unordered batches to stay well under the BSON message limit
+        ingest_collection = self.collection.with_options(write_concern=_INGEST_WRITE_CONCERN)
+        batch_size = DatabaseConstants.MONGODB_BULK_BATCH_SIZE
+        upserted = 0
+        for start in range(0, len(bulk_ops), batch_size):
+            result = ingest_collection.bulk_write(bulk_ops[start:start + batch_size], ordered=False)
+            upserted += result.upserted_count + result.modified_count
+        logger.info("MongoDB: Upserted %s documents", upserted)
+    
+    async def add_documents_async(self, documents: List[Dict[str, Any]]) -> None:
+        """
+        Async variant of add_documents that writes through the Motor client,
+        so ingestion code running on the event loop does not block on MongoDB.
         
-        result = self.collection.bulk_write(bulk_ops, ordered=False)
-        logger.info(f"MongoDB: Upserted {result.upserted_count + result.modified_count} documents")
+        Args:
+            documents: Same structure as add_documents
+        """
+        if not documents:
+            return
+        
+        bulk_ops = self._build_upsert_ops(documents)
+        
+        ingest_collection = self.async_collection.with_options(write_concern=_INGEST_WRITE_CONCERN)
+        batch_size = DatabaseConstants.MONGODB_BULK_BATCH_SIZE
+        upserted = 0
+        for start in range(0, len(bulk_ops), batch_size):
+            result = await ingest_collection.bulk_write(bulk_ops[start:start + batch_size], ordered=False)
+            upserted += result.upserted_count + result.modified_count
+        logger.info("MongoDB: Upserted %s documents", upserted)
     
     def search_documents(
         self,
@@ -219,7 +310,8 @@ class MongoDocumentStore:
         Args:
             query: Search query string
             top_k: Maximum number of results
-            source_filter: Optional source file filter
+            source_filter: Optional source file filter, matched as a case-insensitive
+                substring (a scan; get_documents_by_source does index-backed exact lookups)
             
         Returns:
             List of documents with scores
@@ -240,7 +332,7 @@ class MongoDocumentStore:
             # Execute search with text score
             cursor = self.collection.find(
                 search_filter,
-                {"score": {"$meta": "textScore"}}
+                _TEXT_SEARCH_PROJECTION
             ).sort([("score", {"$meta": "textScore"})]).limit(top_k)
         
             results = []
@@ -252,10 +344,10 @@ class MongoDocumentStore:
                     "score": doc.get("score", 0.0)
                 })
             
-            logger.info(f"MongoDB search: '{query}' returned {len(results)} results")
+            logger.info("MongoDB search: '%s' returned %s results", query, len(results))
             return results
         except Exception as e:
-            logger.error(f"Error in MongoDB search: {e}")
+            logger.error("Error in MongoDB search: %s", e)
             return []
     
     async def query(
@@ -290,15 +382,15 @@ class MongoDocumentStore:
                     ]
                 }
             
-            logger.info(f"MongoDB query filter: {search_filter}")
+            logger.info("MongoDB query filter: %s", search_filter)
             
-            # Execute search with text score
-            cursor = self.collection.find(
+            # Execute search with text score without blocking the event loop
+            cursor = self.async_collection.find(
                 search_filter,
-                {"score": {"$meta": "textScore"}}
+                _TEXT_SEARCH_PROJECTION
             ).sort([("score", {"$meta": "textScore"})]).limit(top_k)
             
-            docs = list(cursor)
+            docs = await cursor.to_list(length=top_k)
             
             if with_scores:
                 documents = []
@@ -312,7 +404,7 @@ class MongoDocumentStore:
                     })
                     scores.append(doc.get("score", 0.0))
                 
-                logger.info(f"MongoDB async query: '{query}' returned {len(documents)} results")
+                logger.info("MongoDB async query: '%s' returned %s results", query, len(documents))
                 return documents, scores
             else:
                 documents = []
@@ -323,11 +415,11 @@ class MongoDocumentStore:
                         "attributes": doc["metadata"]
                     })
                     
-                logger.info(f"MongoDB async query: '{query}' returned {len(documents)} results")  
+                logger.info("MongoDB async query: '%s' returned %s results", query, len(documents))
                 return documents
                 
         except Exception as e:
-            logger.error(f"Error in MongoDB query: {e}")
+            logger.error("Error in MongoDB query: %s", e)
             if with_scores:
                 return [], []
             else:
@@ -359,7 +451,7 @@ class MongoDocumentStore:
     def delete_documents_by_source(self, source: str) -> int:
         """Delete all documents from a specific source file"""
         result = self.collection.delete_many({"metadata.source": source})
-        logger.info(f"Deleted {result.deleted_count} documents from source: {source}")
+        logger.info("Deleted %s documents from source: %s", result.deleted_count, source)
         return result.deleted_count
     
     def get_collection_stats(self) -> Dict[str, Any]:
@@ -372,7 +464,9 @@ class MongoDocumentStore:
         }
     
     def close(self):
-        """Close MongoDB connection"""
-        if hasattr(self, 'client'):
+        """Close MongoDB connections owned by this store (the shared client stays open)"""
+        if self._owns_client:
             self.client.close()
-            logger.info("MongoDB connection closed")
\ No newline at end of file
+            self._owns_client = False
+        self._close_async_client()
+        logger.info("MongoDB connection closed")
\ No newline at end of file
@@ -1,10 +1,18 @@
 import uuid
 import logging
-from typing import List, Dict, Any
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
+from typing import List, Dict, Any, Iterator, Optional, Union
+
+import numpy as np
+from qdrant_client import QdrantClient, AsyncQdrantClient
+from qdrant_client.models import (
+    Distance, VectorParams, Batch,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    SearchParams, QuantizationSearchParams
+)
 from qdrant_client.http.exceptions import UnexpectedResponse
 
+from app.core.config.constants import DatabaseConstants
+
 logger = logging.getLogger(__name__)
 
 class QdrantConnectionError(Exception):
@@ -17,26 +25,50 @@ class QdrantVectorStore:
         host: str,
         port: int,
         collection_name: str,
-        validate_on_init: bool = True
+        validate_on_init: bool = True,
+        grpc_port: int = DatabaseConstants.DEFAULT_QDRANT_GRPC_PORT
     ):
         self.host = host
         self.port = port
+        self.grpc_port = grpc_port
         self.collection_name = collection_name
-        self.client = QdrantClient(host=host, port=port)
+        self.client = self._create_client()
+        self._async_client: Optional[AsyncQdrantClient] = None
         
         # Validate connection if requested (skip for setup scenarios)
         if validate_on_init:
             self._validate_connection()
-            logger.info(f"Qdrant VectorStore initialized successfully: {host}:{port}/{collection_name}")
+            logger.info("Qdrant VectorStore initialized successfully: %s:%s/%s", host, port, collection_name)
         else:
-            logger.info(f"Qdrant VectorStore initialized (validation skipped): {host}:{port}/{collection_name}")
+            logger.info("Qdrant VectorStore initialized (validation skipped): %s:%s/%s", host, port, collection_name)
+    
+    def _create_client(self) -> QdrantClient:
+        """Create a client that talks gRPC (protobuf packed floats) instead of HTTP+JSON"""
+        return QdrantClient(
+            host=self.host,
+            port=self.port,
+            grpc_port=self.grpc_port,
+            prefer_grpc=True
+        )
+    
+    @property
+    def async_client(self) -> AsyncQdrantClient:
+        """Async gRPC client for writes awaited on the event loop, created on first use"""
+        if self._async_client is None:
+            self._async_client = AsyncQdrantClient(
+                host=self.host,
+                port=self.port,
+                grpc_port=self.grpc_port,
+                prefer_grpc=True
+            )
+        return self._async_client
     
     def _validate_connection(self):
         """Test connection and collection availability"""
         try:
             # Test basic connection to Qdrant server
             collections_response = self.client.get_collections()
-            logger.debug(f"Qdrant connection test successful, found {len(collections_response.collections)} collections")
+            logger.debug("Qdrant connection test successful, found %s collections", len(collections_response.collections))
             
             # Check if our collection exists
             collection_names = [col.name for col in collections_response.collections]
@@ -47,7 +79,7 @@ class QdrantVectorStore:
             
             # Test collection access
             collection_info = self.client.get_collection(self.collection_name)
-            logger.debug(f"Collection '{self.collection_name}' validated: {collection_info.points_count} points")
+            logger.debug("Collection '%s' validated: %s points", self.collection_name, collection_info.points_count)
             
         except UnexpectedResponse as e:
             raise QdrantConnectionError(f"Qdrant server error: {e}")
@@ -70,19 +102,30 @@ class QdrantVectorStore:
                 "collection_name": self.collection_name
             }
     
+    def points_count(self) -> int:
+        """Number of points in the collection; raises QdrantConnectionError on failure"""
+        try:
+            return self.client.get_collection(self.collection_name).points_count
+        except Exception as e:
+            raise QdrantConnectionError(f"Failed to read Qdrant point count: {e}")
+    
     def _reconnect(self):
         """Attempt to reconnect to Qdrant"""
         try:
             logger.info("Attempting to reconnect to Qdrant...")
-            self.client = QdrantClient(host=self.host, port=self.port)
+            self.client = self._create_client()
+            self._async_client = None
             self._validate_connection()
             logger.info("Qdrant reconnection successful")
         except Exception as e:
-            logger.error(f"Qdrant reconnection failed: {e}")
+            logger.error("Qdrant reconnection failed: %s", e)
             raise QdrantConnectionError(f"Failed to reconnect to Qdrant: {e}")
     
     def create_collection(self, vector_size: int):
-        """Create collection if not exists"""
+        """
+        Create collection if not exists. Full-precision vectors live on disk while
+        INT8 scalar-quantized copies stay in RAM for HNSW traversal.
+        """
         try:
             collections = self.client.get_collections().collections
             collection_names = [col.name for col in collections]
@@ -90,7 +133,17 @@ class QdrantVectorStore:
             if self.collection_name not in collection_names:
                 self.client.create_collection(
                     collection_name=self.collection_name,
-                    vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE)
+                    vectors_config=VectorParams(
+                        size=vector_size,
+                        distance=Distance.COSINE,
+                        on_disk=True
+                    ),
+                    quantization_config=ScalarQuantization(
+                        scalar=ScalarQuantizationConfig(
+                            type=ScalarType.INT8,
+                            always_ram=True
+                        )
+                    )
                 )
                 print(f"Created collection: {self.collection_name}")
             else:
@@ -107,50 +160,71 @@ class QdrantVectorStore:
         except Exception as e:
             print(f"Error deleting collection: {e}")
     
+    def _iter_point_batches(self, documents_with_embeddings: List[tuple]) -> Iterator[Batch]:
+        """
+        Yield columnar Batch upserts (parallel id/vector/payload lists) instead of one
+        PointStruct per document, in slices of QDRANT_UPSERT_BATCH_SIZE.
+        """
+        batch_size = DatabaseConstants.QDRANT_UPSERT_BATCH_SIZE
+        for start in range(0, len(documents_with_embeddings), batch_size):
+            batch = documents_with_embeddings[start:start + batch_size]
+            yield Batch(
+                ids=[str(uuid.uuid4()) for _ in batch],
+                # float32 arrays from the embedding service become plain float lists
+                vectors=[np.asarray(embedding, dtype=np.float32).tolist() for _, embedding in batch],
+                payloads=[
+                    {"text": doc.get_content(), "metadata": doc.metadata}
+                    for doc, _ in batch
+                ]
+            )
+    
     def add_documents(self, documents_with_embeddings: List[tuple]):
         """Add documents with their embeddings to Qdrant"""
-        points = []
-        
-        for doc, embedding in documents_with_embeddings:
-            point_id = str(uuid.uuid4())
-            
-            point = PointStruct(
-                id=point_id,
-                vector=embedding,
-                payload={
-                    "text": doc.get_content(),
-                    "metadata": doc.metadata
-                }
-            )
-            points.append(point)
-        
         try:
-            self.client.upsert(
-                collection_name=self.collection_name,
-                points=points
-            )
-            print(f"Added {len(points)} documents to Qdrant")
+            for points in self._iter_point_batches(documents_with_embeddings):
+                self.client.upsert(collection_name=self.collection_name, points=points)
+            logger.info("Added %s documents to Qdrant", len(documents_with_embeddings))
         except Exception as e:
-            print(f"Error adding documents: {e}")
+            logger.error("Error adding documents: %s", e)
+            raise
+    
+    async def add_documents_async(self, documents_with_embeddings: List[tuple]):
+        """Async variant of add_documents that upserts through AsyncQdrantClient"""
+        try:
+            for points in self._iter_point_batches(documents_with_embeddings):
+                await self.async_client.upsert(collection_name=self.collection_name, points=points)
+            logger.info("Added %s documents to Qdrant", len(documents_with_embeddings))
+        except Exception as e:
+            logger.error("Error adding documents: %s", e)
             raise
     
     def search(
         self,
-        query_vector: List[float],
+        query_vector: Union[List[float], np.ndarray],
         limit: int,
         score_threshold: float
     ) -> List[Dict[str, Any]]:
-        """Search for similar documents with connection validation"""
+        """
+        Search for similar documents with connection validation. HNSW runs over the
+        INT8 vectors, then the oversampled candidates are rescored with full precision.
+        """
         try:
-            search_result = self.client.search(
+            search_result = self.client.query_points(
                 collection_name=self.collection_name,
-                query_vector=query_vector,
+                query=query_vector,
                 limit=limit,
-                score_threshold=score_threshold
+                score_threshold=score_threshold,
+                search_params=SearchParams(
+                    quantization=QuantizationSearchParams(
+                        ignore=False,
+                        rescore=True,
+                        oversampling=DatabaseConstants.QDRANT_QUANTIZATION_OVERSAMPLING
+                    )
+                )
             )
             
             results = []
-            for scored_point in search_result:
+            for scored_point in search_result.points:
                 result = {
                     "id": scored_point.id,
                     "score": scored_point.score,
@@ -159,14 +233,14 @@ class QdrantVectorStore:
                 }
                 results.append(result)
             
-            logger.debug(f"Qdrant search completed: {len(results)} results found")
+            logger.debug("Qdrant search completed: %s results found", len(results))
             return results
             
         except UnexpectedResponse as e:
-            logger.error(f"Qdrant server error during search: {e}")
+            logger.error("Qdrant server error during search: %s", e)
             raise QdrantConnectionError(f"Qdrant server error: {e}")
         except Exception as e:
-            logger.error(f"Error searching documents: {e}")
+            logger.error("Error searching documents: %s", e)
             raise QdrantConnectionError(f"Qdrant search failed: {e}")
     
     def get_collection_info(self):
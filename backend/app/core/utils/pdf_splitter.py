@@ -4,7 +4,6 @@ Tools for splitting PDF files into manageable chunks for OCR processing
 """
 
 import logging
-import tempfile
 from pathlib import Path
 from typing import List, Tuple
 import fitz  # PyMuPDF
@@ -26,15 +25,15 @@ class PDFPageSplitter:
         self.max_pages_per_chunk = max_pages_per_chunk
         logger.info(f"PDFPageSplitter initialized with max_pages_per_chunk={max_pages_per_chunk}")
     
-    def split_pdf_to_chunks(self, pdf_path: str) -> List[Tuple[str, int, int]]:
+    def split_pdf_to_chunks(self, pdf_path: str) -> List[Tuple[bytes, int, int]]:
         """
-        Split PDF into temporary chunk files
+        Split PDF into in-memory chunk PDFs
         
         Args:
             pdf_path: Path to the PDF file
             
         Returns:
-            List of tuples (chunk_file_path, start_page, end_page)
+            List of tuples (chunk_pdf_bytes, start_page, end_page)
         """
         try:
             pdf_path = Path(pdf_path)
@@ -55,21 +54,14 @@ class PDFPageSplitter:
             for start_page in range(0, total_pages, self.max_pages_per_chunk):
                 end_page = min(start_page + self.max_pages_per_chunk - 1, total_pages - 1)
                 
-                # Create temporary file for this chunk
-                temp_file = tempfile.NamedTemporaryFile(
-                    suffix=f"_pages_{start_page+1}-{end_page+1}.pdf", 
-                    delete=False
-                )
-                temp_file.close()
-                
-                # Create new PDF with selected pages
+                # Create new PDF with selected pages, serialized in memory
                 chunk_doc = fitz.open()
                 chunk_doc.insert_pdf(doc, from_page=start_page, to_page=end_page)
-                chunk_doc.save(temp_file.name)
+                chunk_bytes = chunk_doc.tobytes()
                 chunk_doc.close()
                 
-                chunks.append((temp_file.name, start_page + 1, end_page + 1))
-                logger.debug(f"Created chunk: pages {start_page+1}-{end_page+1} -> {temp_file.name}")
+                chunks.append((chunk_bytes, start_page + 1, end_page + 1))
+                logger.debug(f"Created chunk: pages {start_page+1}-{end_page+1} ({len(chunk_bytes)} bytes)")
             
             doc.close()
             
@@ -80,25 +72,6 @@ class PDFPageSplitter:
             logger.error(f"Error splitting PDF {pdf_path}: {e}")
             raise
     
-    def cleanup_temp_files(self, chunk_paths: List[str]) -> None:
-        """
-        Clean up temporary chunk files
-        
-        Args:
-            chunk_paths: List of temporary file paths to clean up
-        """
-        try:
-            for chunk_path in chunk_paths:
-                temp_file = Path(chunk_path)
-                if temp_file.exists():
-                    temp_file.unlink()
-                    logger.debug(f"Cleaned up temp file: {chunk_path}")
-            
-            logger.info(f"Cleaned up {len(chunk_paths)} temporary chunk files")
-            
-        except Exception as e:
-            logger.error(f"Error cleaning up temp files: {e}")
-    
     def get_pdf_info(self, pdf_path: str) -> dict:
         """
         Get basic information about the PDF
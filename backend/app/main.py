@@ -6,11 +6,15 @@ Main entry point for the API with observability integration
 import logging
 import uvicorn
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, Request
+from typing import Any
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
+from pydantic import BaseModel
 
 # Import configuration and logging
 from app.core.config.settings import get_settings
+from app.core.config.config_loader import get_config_loader
 from app.core.config.logging_config import setup_logging
 
 # Import API schemas
@@ -18,25 +22,42 @@ from app.api.schema.request import AskRequest
 from app.api.schema.response import AskResponse, HealthResponse, MetricsResponse
 
 # Import core services
-from app.core.agent import GeotechAgent
+from app.core.agent import GeotechAgent, get_agent
+from app.core.llms.openai import close_shared_http_client
+from app.core.storages.docstores.mongodb import close_shared_mongo_clients
 from app.services.observability import get_metrics_collector
 
 # Setup logging
 setup_logging()
 logger = logging.getLogger("app.main")
 
-# Global agent instance
-agent: GeotechAgent = None
+class PydanticJSONResponse(Response):
+    """
+    JSON response rendered straight from a pydantic model via model_dump_json,
+    skipping FastAPI's jsonable_encoder + json.dumps round trip
+    """
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode("utf-8")
+        return super().render(content)
+
+async def agent_dependency() -> GeotechAgent:
+    """Shared agent for request handlers (async so FastAPI doesn't hop to its threadpool)"""
+    return get_agent()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management"""
-    global agent
-    
     # Startup
     logger.info("Starting Geotechnical AI Service...")
     try:
-        agent = GeotechAgent()
+        # Parse the agent YAML once so the agent below reads its prompts from cache
+        get_config_loader().load_agent_config()
+        
+        # Build the shared agent up front so the first request doesn't pay for it
+        get_agent()
         logger.info("GeotechAgent initialized successfully")
         
         # Initialize metrics collector
@@ -44,14 +65,18 @@ async def lifespan(app: FastAPI):
         logger.info("Metrics collector initialized")
         
     except Exception as e:
-        logger.error(f"Failed to initialize services: {e}")
+        logger.error("Failed to initialize services: %s", e)
         raise
         
     yield
     
     # Shutdown
     logger.info("Shutting down Geotechnical AI Service...")
-    # Cleanup can be added here if needed
+    # Release the store's own connections (its Motor client) before the shared pools
+    get_agent().rag_service.mongodb_store.close()
+    get_agent.cache_clear()
+    await close_shared_http_client()
+    close_shared_mongo_clients()
 
 # Create FastAPI application
 app = FastAPI(
@@ -102,21 +127,15 @@ async def get_metrics():
         return MetricsResponse(**metrics_data)
         
     except Exception as e:
-        logger.error(f"Failed to get metrics: {e}")
+        logger.error("Failed to get metrics: %s", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve metrics")
 
-@app.post("/ask", response_model=AskResponse)
-async def ask_question(request: AskRequest):
+@app.post("/ask", response_class=PydanticJSONResponse, responses={200: {"model": AskResponse}})
+async def ask_question(request: AskRequest, agent: GeotechAgent = Depends(agent_dependency)):
     """
     Main endpoint for asking geotechnical engineering questions
     Processes questions through Plan → Execute → Synthesize workflow
     """
-    global agent
-    
-    if not agent:
-        logger.error("GeotechAgent not initialized")
-        raise HTTPException(status_code=500, detail="Service not properly initialized")
-    
     try:
         # Write to file to ensure we capture this
         with open("api_debug.log", "a") as f:
@@ -135,7 +154,7 @@ async def ask_question(request: AskRequest):
         print(f"About to call agent.run()...", flush=True)
         print(f"=== END API ENDPOINT DEBUG ===\n", flush=True)
         
-        logger.info(f"[API DEBUG] Received question: '{request.question}'")
+        logger.info("[API DEBUG] Received question: '%s'", request.question)
         
         # Process the question through the agent
         response = await agent.run(
@@ -150,20 +169,20 @@ async def ask_question(request: AskRequest):
         print(f"Trace ID: {response.trace_id}", flush=True)
         print(f"=== END API RESPONSE DEBUG ===\n", flush=True)
         
-        logger.info(f"[API DEBUG] Response received:")
-        logger.info(f"    Answer: {response.answer}")
-        logger.info(f"    Citations: {len(response.citations)}")
-        logger.info(f"Successfully processed question (trace_id={response.trace_id})")
-        return response
+        logger.info("[API DEBUG] Response received:")
+        logger.info("    Answer: %s", response.answer)
+        logger.info("    Citations: %s", len(response.citations))
+        logger.info("Successfully processed question (trace_id=%s)", response.trace_id)
+        return PydanticJSONResponse(content=response)
         
     except Exception as e:
         print(f"\n=== API EXCEPTION DEBUG ===", flush=True)
         print(f"Exception in API endpoint: {e}", flush=True)
         print(f"=== END API EXCEPTION DEBUG ===\n", flush=True)
         
-        logger.error(f"Failed to process question: {e}")
+        logger.error("Failed to process question: %s", e)
         import traceback
-        logger.error(f"Full traceback: {traceback.format_exc()}")
+        logger.error("Full traceback: %s", traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Failed to process question: {str(e)}")
 
 if __name__ == "__main__":
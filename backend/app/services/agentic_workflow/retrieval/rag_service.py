@@ -3,10 +3,10 @@ import os
 import sys
 import asyncio
 import logging
+import time
 from pathlib import Path
 from typing import List, Dict, Any, Set
 from fastapi import HTTPException
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 project_root = Path(__file__).parent.parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
@@ -32,6 +32,7 @@ class RAGService:
         self.vector_store = QdrantVectorStore(
             host=settings.QDRANT_HOST,
             port=settings.QDRANT_PORT,
+            grpc_port=settings.QDRANT_GRPC_PORT,
             collection_name=settings.QDRANT_COLLECTION_NAME
         )
         self.mongodb_store = MongoDocumentStore(
@@ -42,11 +43,10 @@ class RAGService:
         )
 
     async def search(self, query: str, k: int, score_threshold: float) -> List[Citation]:
-        import time
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
-            logger.info(f"--- RAGService.search ENTRY --- Query: '{query}', k={k}, threshold={score_threshold}")
+            logger.info("--- RAGService.search ENTRY --- Query: '%s', k=%s, threshold=%s", query, k, score_threshold)
             
             # Health check connections before search
             await self._health_check()
@@ -55,7 +55,7 @@ class RAGService:
                 query=query, vector_k=k, keyword_k=k, score_threshold=score_threshold
             )
             
-            logger.info(f"Hybrid search returned {len(hybrid_results)} final results.")
+            logger.info("Hybrid search returned %s final results.", len(hybrid_results))
             
             # DETAILED DEBUG: Print each result to terminal
             print(f"\n=== RAG DEBUG: Processing {len(hybrid_results)} hybrid results ===", flush=True)
@@ -95,14 +95,14 @@ class RAGService:
             
             print(f"=== RAG DEBUG: Created {len(citations)} Citation objects ===\n")
             
-            duration = (time.time() - start_time) * 1000
-            logger.info(f"RAG Search completed in {duration:.2f}ms. Converted to {len(citations)} Citation objects.")
+            duration = (time.perf_counter_ns() - start_ns) / 1_000_000
+            logger.info("RAG Search completed in %.2fms. Converted to %s Citation objects.", duration, len(citations))
             
             return citations
             
         except (QdrantConnectionError, MongoConnectionError) as e:
-            duration = (time.time() - start_time) * 1000
-            logger.error(f"RAG Service connection error after {duration:.2f}ms: {e}")
+            duration = (time.perf_counter_ns() - start_ns) / 1_000_000
+            logger.error("RAG Service connection error after %.2fms: %s", duration, e)
             
             # Try to reconnect once before failing
             try:
@@ -125,20 +125,20 @@ class RAGService:
                     for res in hybrid_results
                 ]
                 
-                duration = (time.time() - start_time) * 1000
-                logger.info(f"RAG Search successful after reconnection in {duration:.2f}ms")
+                duration = (time.perf_counter_ns() - start_ns) / 1_000_000
+                logger.info("RAG Search successful after reconnection in %.2fms", duration)
                 return citations
                 
             except Exception as retry_error:
-                logger.error(f"Reconnection and retry failed: {retry_error}")
+                logger.error("Reconnection and retry failed: %s", retry_error)
                 raise HTTPException(
                     status_code=503,
                     detail=f"RAG Service unavailable after reconnection attempt: {str(e)}"
                 )
                 
         except Exception as e:
-            duration = (time.time() - start_time) * 1000
-            logger.error(f"RAG Service error after {duration:.2f}ms: {e}", exc_info=True)
+            duration = (time.perf_counter_ns() - start_ns) / 1_000_000
+            logger.error("RAG Service error after %.2fms: %s", duration, e, exc_info=True)
             raise HTTPException(
                 status_code=500,
                 detail=f"RAG Service internal error: {str(e)}"
@@ -158,7 +158,7 @@ class RAGService:
             logger.info("RAG Service reconnection successful")
             
         except Exception as e:
-            logger.error(f"RAG Service reconnection failed: {e}")
+            logger.error("RAG Service reconnection failed: %s", e)
             raise RAGServiceError(f"Failed to reconnect RAG Service: {e}")
     
     async def _health_check(self):
@@ -179,7 +179,7 @@ class RAGService:
         except (QdrantConnectionError, MongoConnectionError):
             raise  # Re-raise connection errors
         except Exception as e:
-            logger.error(f"Health check failed: {e}")
+            logger.error("Health check failed: %s", e)
             raise RAGServiceError(f"RAG Service health check failed: {e}")
 
     async def hybrid_search(self, query: str, vector_k: int, keyword_k: int, score_threshold: float) -> List[Dict[str, Any]]:
@@ -193,18 +193,18 @@ class RAGService:
             logger.info("Step 1: Performing vector search...")
             print("Step 1: Performing vector search...")
             vector_results = await self.vector_search(query, vector_k, score_threshold)
-            logger.info(f"Vector search found {len(vector_results)} results.")
+            logger.info("Vector search found %s results.", len(vector_results))
             print(f"Vector search found {len(vector_results)} results.")
 
             logger.info("Step 2: Extracting keywords...")
             print("Step 2: Extracting keywords...")
             keywords = await self.gemini_service.extract_keywords(query)
-            logger.info(f"Extracted keywords: {keywords} (Count: {len(keywords)})")
+            logger.info("Extracted keywords: %s (Count: %s)", keywords, len(keywords))
             print(f"Extracted keywords: {keywords} (Count: {len(keywords)})")
             
             min_keywords = RAGConstants.MIN_KEYWORDS_THRESHOLD
             if len(keywords) < min_keywords:
-                logger.info(f"Keyword count < {min_keywords}. Using VECTOR-ONLY results.")
+                logger.info("Keyword count < %s. Using VECTOR-ONLY results.", min_keywords)
                 print(f"Keyword count < {min_keywords}. Using VECTOR-ONLY results.")
                 print(f"Returning {len(vector_results)} vector results")
                 return vector_results
@@ -217,24 +217,23 @@ class RAGService:
             logger.info("Step 5: Performing keyword search...")
             print("Step 5: Performing keyword search...")
             keyword_results = await self._keyword_search_with_list(keywords, keyword_k)
-            logger.info(f"Keyword search found {len(keyword_results)} results.")
+            logger.info("Keyword search found %s results.", len(keyword_results))
             print(f"Keyword search found {len(keyword_results)} results.")
             
             combined_results = self._combine_and_deduplicate(vector_results_trimmed, keyword_results)
-            logger.info(f"Final combined/deduplicated count: {len(combined_results)}.")
+            logger.info("Final combined/deduplicated count: %s.", len(combined_results))
             print(f"Final combined/deduplicated count: {len(combined_results)}.")
             return combined_results
             
         except Exception as e:
-            logger.error(f"Error in hybrid_search, falling back to vector-only. Error: {e}", exc_info=True)
+            logger.error("Error in hybrid_search, falling back to vector-only. Error: %s", e, exc_info=True)
             return await self.vector_search(query, vector_k, score_threshold)
 
     async def vector_search(self, query: str, k: int, score_threshold: float) -> List[Dict[str, Any]]:
         """Perform vector search with proper async handling."""
-        import time
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
-        logger.info(f"--- RAGService.vector_search ENTRY --- k={k}, threshold={score_threshold}")
+        logger.info("--- RAGService.vector_search ENTRY --- k=%s, threshold=%s", k, score_threshold)
         try:
             # Python 3.7+ compatible approach using run_in_executor
             loop = asyncio.get_event_loop()
@@ -242,13 +241,13 @@ class RAGService:
             def sync_blocking_code():
                 logger.info("Creating query embedding...")
                 query_embedding = self.embedding_service.get_query_embedding(query)
-                logger.info(f"Embedding created (dim: {len(query_embedding)}).")
+                logger.info("Embedding created (dim: %s).", len(query_embedding))
                 
                 logger.info("Searching Qdrant...")
                 results = self.vector_store.search(
                     query_vector=query_embedding, limit=k, score_threshold=score_threshold
                 )
-                logger.info(f"Qdrant returned {len(results)} raw results.")
+                logger.info("Qdrant returned %s raw results.", len(results))
                 
                 if not results:
                     logger.warning("No vector search results found - check Qdrant data availability")
@@ -267,38 +266,37 @@ class RAGService:
                     {"text": r["text"], "score": r["score"], "metadata": r["metadata"], "search_type": "vector"}
                     for r in results
                 ]
-                logger.info(f"Formatted {len(formatted)} vector results.")
+                logger.info("Formatted %s vector results.", len(formatted))
                 print(f"=== VECTOR SEARCH DEBUG: Formatted {len(formatted)} results ===")
                 return formatted
 
             # Use run_in_executor for compatibility with Python 3.7+
             results = await loop.run_in_executor(None, sync_blocking_code)
             
-            duration = (time.time() - start_time) * 1000
-            logger.info(f"Vector search completed in {duration:.2f}ms with {len(results)} results")
+            duration = (time.perf_counter_ns() - start_ns) / 1_000_000
+            logger.info("Vector search completed in %.2fms with %s results", duration, len(results))
             return results
 
         except Exception as e:
-            duration = (time.time() - start_time) * 1000
-            logger.error(f"Error in vector_search after {duration:.2f}ms: {e}", exc_info=True)
+            duration = (time.perf_counter_ns() - start_ns) / 1_000_000
+            logger.error("Error in vector_search after %.2fms: %s", duration, e, exc_info=True)
             return []
 
     async def _keyword_search_with_list(self, keywords: List[str], k: int) -> List[Dict[str, Any]]:
         """Keyword search using pre-extracted keyword list with proper async handling."""
-        import time
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
-        logger.info(f"--- RAGService._keyword_search_with_list ENTRY --- k={k}, keywords={keywords}")
+        logger.info("--- RAGService._keyword_search_with_list ENTRY --- k=%s, keywords=%s", k, keywords)
         try:
             if not keywords:
                 logger.warning("No keywords provided for search")
                 return []
             
             query_string = " ".join(keywords)
-            logger.info(f"MongoDB query string: '{query_string}'")
+            logger.info("MongoDB query string: '%s'", query_string)
             
             async def async_mongodb_query():
-                logger.info(f"[MONGODB DEBUG] Executing async query with: '{query_string}'")
+                logger.info("[MONGODB DEBUG] Executing async query with: '%s'", query_string)
                 # Use async MongoDB method with proper parameters
                 documents, scores = await self.mongodb_store.query(
                     query=query_string,
@@ -306,7 +304,7 @@ class RAGService:
                     doc_ids=None,  # Search all documents for now
                     with_scores=True
                 )
-                logger.info(f"[MONGODB DEBUG] Found {len(documents)} documents with scores")
+                logger.info("[MONGODB DEBUG] Found %s documents with scores", len(documents))
                 
                 if not documents:
                     logger.warning("MongoDB returned no results - check data availability and text indexes")
@@ -316,20 +314,20 @@ class RAGService:
             # Execute async MongoDB query directly
             docs, scores = await async_mongodb_query()
             
-            duration = (time.time() - start_time) * 1000
-            logger.info(f"MongoDB keyword search completed in {duration:.2f}ms. Returned {len(docs)} documents.")
+            duration = (time.perf_counter_ns() - start_ns) / 1_000_000
+            logger.info("MongoDB keyword search completed in %.2fms. Returned %s documents.", duration, len(docs))
             
             return [
                 {"text": doc["text"], "score": score, "metadata": doc["attributes"], "search_type": "keyword"}
                 for doc, score in zip(docs, scores)
             ]
         except Exception as e:
-            duration = (time.time() - start_time) * 1000
-            logger.error(f"Error in _keyword_search_with_list after {duration:.2f}ms: {e}", exc_info=True)
+            duration = (time.perf_counter_ns() - start_ns) / 1_000_000
+            logger.error("Error in _keyword_search_with_list after %.2fms: %s", duration, e, exc_info=True)
             return []
 
     def _combine_and_deduplicate(self, vector_results: List[Dict[str, Any]], keyword_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        logger.info(f"--- Combining {len(vector_results)} vector and {len(keyword_results)} keyword results ---")
+        logger.info("--- Combining %s vector and %s keyword results ---", len(vector_results), len(keyword_results))
         combined = []
         seen_texts: Set[str] = set()
         for result in vector_results:
@@ -355,7 +353,7 @@ class RAGService:
             mongodb_count = self.mongodb_store.collection.count_documents(search_filter)
             vector_stats["mongodb_documents"] = mongodb_count
         except Exception as e:
-            logger.error(f"Error getting MongoDB stats: {e}")
+            logger.error("Error getting MongoDB stats: %s", e)
             vector_stats["mongodb_documents"] = "unknown"
         
         return vector_stats
\ No newline at end of file
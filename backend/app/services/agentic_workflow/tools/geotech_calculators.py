@@ -4,7 +4,15 @@ Specialized tools for geotechnical calculations
 """
 
 from typing import Dict, Union, Tuple
-from app.core.config.constants import ToolConstants
+
+import numpy as np
+
+from app.core.config.constants import ToolConstants, ValidationConstants
+
+# Bearing capacity factor table as contiguous columns (sorted by friction angle) for np.interp
+_PHI_TABLE, _NC_TABLE, _NQ_TABLE, _NR_TABLE = np.array(
+    ToolConstants.BEARING_CAPACITY_ROWS, dtype=np.float64
+).T.copy()
 
 class GeotechCalculationError(Exception):
     """Custom exception for geotech calculation errors"""
@@ -65,37 +73,15 @@ def _get_bearing_capacity_factors(phi: int) -> Tuple[float, float, float]:
     if phi in ToolConstants.BEARING_CAPACITY_FACTORS:
         return ToolConstants.BEARING_CAPACITY_FACTORS[phi]
     
-    # Linear interpolation for values between table entries
-    phi_values = sorted(ToolConstants.BEARING_CAPACITY_FACTORS.keys())
-    
-    # Find surrounding values
-    lower_phi = None
-    upper_phi = None
-    
-    for phi_val in phi_values:
-        if phi_val <= phi:
-            lower_phi = phi_val
-        if phi_val >= phi and upper_phi is None:
-            upper_phi = phi_val
-            break
-    
-    if lower_phi is None or upper_phi is None:
+    if not (_PHI_TABLE[0] <= phi <= _PHI_TABLE[-1]):
         raise GeotechCalculationError(f"Friction angle φ={phi}° is outside valid range ({ValidationConstants.MIN_PHI_ANGLE}-{ValidationConstants.MAX_PHI_ANGLE}°)")
     
-    if lower_phi == upper_phi:
-        return ToolConstants.BEARING_CAPACITY_FACTORS[lower_phi]
+    # Linear interpolation between table entries
+    nc_interp = np.interp(phi, _PHI_TABLE, _NC_TABLE)
+    nq_interp = np.interp(phi, _PHI_TABLE, _NQ_TABLE)
+    nr_interp = np.interp(phi, _PHI_TABLE, _NR_TABLE)
     
-    # Linear interpolation
-    lower_factors = ToolConstants.BEARING_CAPACITY_FACTORS[lower_phi]
-    upper_factors = ToolConstants.BEARING_CAPACITY_FACTORS[upper_phi]
-    
-    ratio = (phi - lower_phi) / (upper_phi - lower_phi)
-    
-    nc_interp = lower_factors[0] + ratio * (upper_factors[0] - lower_factors[0])
-    nq_interp = lower_factors[1] + ratio * (upper_factors[1] - lower_factors[1])
-    nr_interp = lower_factors[2] + ratio * (upper_factors[2] - lower_factors[2])
-    
-    return (round(nc_interp, 2), round(nq_interp, 2), round(nr_interp, 2))
+    return (round(float(nc_interp), 2), round(float(nq_interp), 2), round(float(nr_interp), 2))
 
 def bearing_capacity_calculator(
     B: float, 
@@ -135,7 +121,6 @@ def bearing_capacity_calculator(
             raise GeotechCalculationError("Unit weight γ must be positive (> 0)")
         if Df < 0:
             raise GeotechCalculationError("Footing depth Df must be non-negative (≥ 0)")
-        from app.core.config.constants import ValidationConstants
         if not (ValidationConstants.MIN_PHI_ANGLE <= phi <= ValidationConstants.MAX_PHI_ANGLE):
             raise GeotechCalculationError(f"Friction angle φ must be between {ValidationConstants.MIN_PHI_ANGLE}° and {ValidationConstants.MAX_PHI_ANGLE}°")
         
@@ -242,12 +227,17 @@ def get_tool_description(tool_name: str):
     """Get description for a specific tool"""
     return TOOL_DESCRIPTIONS.get(tool_name)
 
+# Tool name -> implementation, resolved once at import
+_TOOL_FUNCTIONS = {
+    "settlement_calculator": settlement_calculator,
+    "bearing_capacity_calculator": bearing_capacity_calculator,
+}
+
 def call_tool(tool_name: str, **kwargs):
     """Generic tool caller"""
-    if tool_name == "settlement_calculator":
-        return settlement_calculator(**kwargs)
-    elif tool_name == "bearing_capacity_calculator":
-        return bearing_capacity_calculator(**kwargs)
+    tool = _TOOL_FUNCTIONS.get(tool_name)
+    if tool is not None:
+        return tool(**kwargs)
     else:
         return {
             "error": f"Unknown tool: {tool_name}",
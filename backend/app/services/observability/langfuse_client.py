@@ -5,7 +5,7 @@ Simple wrapper for LangFuse tracing integration with GeotechAgent workflow
 
 import logging
 import uuid
-from typing import Optional, Dict, Any, TYPE_CHECKING
+from typing import Optional, Dict, Any, List, TYPE_CHECKING
 from datetime import datetime, timezone
 from contextlib import contextmanager
 
@@ -50,7 +50,7 @@ class LangFuseClient:
             logger.info("LangFuse client initialized successfully")
             return True
         except Exception as e:
-            logger.error(f"Failed to initialize LangFuse client: {e}")
+            logger.error("Failed to initialize LangFuse client: %s", e)
             return False
     
     def start_trace(self, trace_name: str = "geotech_request") -> str:
@@ -58,7 +58,7 @@ class LangFuseClient:
         trace_id = str(uuid.uuid4())
         
         if not self.enabled or not self.client:
-            logger.debug(f"LangFuse disabled. Using mock trace_id: {trace_id}")
+            logger.debug("LangFuse disabled. Using mock trace_id: %s", trace_id)
             return trace_id
             
         try:
@@ -70,10 +70,10 @@ class LangFuseClient:
                     "service": "geotech_ai_service"
                 }
             )
-            logger.debug(f"Started LangFuse trace: {trace_id}")
+            logger.debug("Started LangFuse trace: %s", trace_id)
             return trace_id
         except Exception as e:
-            logger.error(f"Failed to start LangFuse trace: {e}")
+            logger.error("Failed to start LangFuse trace: %s", e)
             return trace_id
     
     def create_span(self, 
@@ -86,7 +86,7 @@ class LangFuseClient:
         span_id = str(uuid.uuid4())
         
         if not self.enabled or not self.client:
-            logger.debug(f"LangFuse disabled. Using mock span_id: {span_id}")
+            logger.debug("LangFuse disabled. Using mock span_id: %s", span_id)
             return span_id
             
         try:
@@ -101,10 +101,10 @@ class LangFuseClient:
                 },
                 input=input_data
             )
-            logger.debug(f"Created LangFuse span: {span_id} for trace: {trace_id}")
+            logger.debug("Created LangFuse span: %s for trace: %s", span_id, trace_id)
             return span_id
         except Exception as e:
-            logger.error(f"Failed to create LangFuse span: {e}")
+            logger.error("Failed to create LangFuse span: %s", e)
             return span_id
     
     def update_span(self,
@@ -114,7 +114,7 @@ class LangFuseClient:
                    end_time: Optional[datetime] = None) -> None:
         """Update span with results and end time"""
         if not self.enabled or not self.client:
-            logger.debug(f"LangFuse disabled. Skipping span update: {span_id}")
+            logger.debug("LangFuse disabled. Skipping span update: %s", span_id)
             return
             
         try:
@@ -132,14 +132,14 @@ class LangFuseClient:
                     update_data["output"] = output_data
                     
                 span.update(**update_data)
-                logger.debug(f"Updated LangFuse span: {span_id}")
+                logger.debug("Updated LangFuse span: %s", span_id)
         except Exception as e:
-            logger.error(f"Failed to update LangFuse span {span_id}: {e}")
+            logger.error("Failed to update LangFuse span %s: %s", span_id, e)
     
     def end_trace(self, trace_id: str, status: str = "SUCCESS") -> None:
         """End trace with final status"""
         if not self.enabled or not self.client:
-            logger.debug(f"LangFuse disabled. Skipping trace end: {trace_id}")
+            logger.debug("LangFuse disabled. Skipping trace end: %s", trace_id)
             return
             
         try:
@@ -151,10 +151,39 @@ class LangFuseClient:
                         output={"status": status},
                         end_time=datetime.now(timezone.utc)
                     )
-                    logger.debug(f"Ended LangFuse trace: {trace_id}")
+                    logger.debug("Ended LangFuse trace: %s", trace_id)
         except Exception as e:
             # Suppress LangFuse errors to avoid spam
-            logger.debug(f"LangFuse trace end skipped {trace_id}: {e}")
+            logger.debug("LangFuse trace end skipped %s: %s", trace_id, e)
+    
+    def record_trace(self,
+                     trace_id: str,
+                     trace_name: str,
+                     spans: List[Dict[str, Any]],
+                     status: str = "SUCCESS") -> None:
+        """
+        Record a finished trace together with all of its spans in one batch.
+        Each span dict carries name, start_time, end_time and optional metadata.
+        The SDK only enqueues these events; its background worker ships them.
+        """
+        if not self.enabled or not self.client:
+            return
+            
+        try:
+            trace = self.client.trace(
+                id=trace_id,
+                name=trace_name,
+                output={"status": status},
+                metadata={
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "service": "geotech_ai_service"
+                }
+            )
+            for span in spans:
+                trace.span(**span)
+            logger.debug("Recorded LangFuse trace %s with %s spans", trace_id, len(spans))
+        except Exception as e:
+            logger.error("Failed to record LangFuse trace %s: %s", trace_id, e)
     
     def flush(self) -> None:
         """Flush any pending traces"""
@@ -163,7 +192,7 @@ class LangFuseClient:
                 self.client.flush()
                 logger.debug("Flushed LangFuse client")
             except Exception as e:
-                logger.error(f"Failed to flush LangFuse client: {e}")
+                logger.error("Failed to flush LangFuse client: %s", e)
 
 # Global client instance
 _langfuse_client: Optional[LangFuseClient] = None
@@ -70,7 +70,7 @@ class MetricsCollector:
             if self._response_times:
                 self._metrics["average_response_time"] = sum(self._response_times) / len(self._response_times)
             
-            logger.debug(f"Recorded response time: {response_time_ms}ms")
+            logger.debug("Recorded response time: %sms", response_time_ms)
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get current metrics snapshot"""
@@ -112,20 +112,20 @@ class MetricsCollector:
             logger.info("Metrics reset")
 
 class RequestTimer:
-    """Context manager for timing requests"""
+    """Context manager for timing requests (usable with both `with` and `async with`)"""
     
     def __init__(self, metrics_collector: MetricsCollector):
         self.metrics_collector = metrics_collector
-        self.start_time = None
+        self.start_ns = None
     
     def __enter__(self):
-        self.start_time = time.time()
+        self.start_ns = time.perf_counter_ns()
         self.metrics_collector.increment_requests()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.start_time:
-            response_time_ms = (time.time() - self.start_time) * 1000
+        if self.start_ns is not None:
+            response_time_ms = (time.perf_counter_ns() - self.start_ns) / 1_000_000
             self.metrics_collector.record_response_time(response_time_ms)
             
             # Record success or failure
@@ -133,6 +133,12 @@ class RequestTimer:
                 self.metrics_collector.increment_successful_requests()
             else:
                 self.metrics_collector.increment_failed_requests()
+    
+    async def __aenter__(self):
+        return self.__enter__()
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.__exit__(exc_type, exc_val, exc_tb)
 
 # Global metrics collector instance
 _metrics_collector: MetricsCollector = None
@@ -7,6 +7,7 @@ import asyncio
 import logging
 import sys
 import time
+import uuid
 from pathlib import Path
 
 # Add project root to Python path
@@ -29,6 +30,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class DocumentForStorage:
+    """Chunk content and metadata with its MongoDB doc_id, as expected by the stores"""
+    def __init__(self, content, metadata, doc_id):
+        self.content = content
+        self.metadata = metadata
+        self.doc_id = doc_id
+    
+    def get_content(self):
+        return self.content
+
 async def main():
     """Main function to setup vector database with contextualization"""
     try:
@@ -42,6 +53,7 @@ async def main():
         vector_store = QdrantVectorStore(
             host=settings.QDRANT_HOST,
             port=settings.QDRANT_PORT,
+            grpc_port=settings.QDRANT_GRPC_PORT,
             collection_name=settings.QDRANT_COLLECTION_NAME,
             validate_on_init=False  # Skip validation for setup - collection will be created
         )
@@ -50,14 +62,14 @@ async def main():
         # Initialize MongoDB document store
         mongodb_config = get_mongodb_config()
         document_store = MongoDocumentStore(
-            host=mongodb_config['host'],
-            port=mongodb_config['port'],
-            database_name=mongodb_config['database'],
-            collection_name=mongodb_config['collection']
+            host=mongodb_config.host,
+            port=mongodb_config.port,
+            database_name=mongodb_config.database,
+            collection_name=mongodb_config.collection
         )
         # Get chunk settings from constants
         chunk_config = get_rag_config()
-        logger.info(f"RAG configuration: top_k={chunk_config['top_k']}, similarity_threshold={chunk_config['similarity_threshold']}")
+        logger.info(f"RAG configuration: top_k={chunk_config.top_k}, similarity_threshold={chunk_config.similarity_threshold}")
         logger.info(f"Chunk configuration: min_size={RAGConstants.MIN_CHUNK_SIZE}, max_size={RAGConstants.MAX_CHUNK_SIZE}")
         
         markdown_reader = MarkdownReader(
@@ -101,7 +113,7 @@ async def main():
             
             # Step 1: Read and chunk markdown
             logger.info("Step 1: Reading and chunking markdown...")
-            chunks = markdown_reader.read_markdown_file(str(md_file))
+            chunks = await markdown_reader.read_markdown_file(str(md_file))
             logger.info(f"Created {len(chunks)} initial chunks")
             
             # Step 2: Contextualize chunks with simple header-based context
@@ -122,31 +134,17 @@ async def main():
                 logger.warning(f"No chunks created from {md_file.name}, skipping storage")
                 continue
             
-            documents_with_embeddings = []
+            documents = []
             documents_for_mongodb = []
             
-            for i, ctx_chunk in enumerate(contextualized_chunks):
+            for ctx_chunk in contextualized_chunks:
                 doc = ctx_chunk.to_document()
                 
                 # Generate unique doc_id
-                import uuid
                 doc_id = str(uuid.uuid4())
                 
-                # Generate embedding for the content (contextualized or original)
-                embedding = embedding_service.get_query_embedding(doc['content'])
-                
                 # Prepare for Qdrant (vector storage)
-                class DocumentForStorage:
-                    def __init__(self, content, metadata, doc_id):
-                        self.content = content
-                        self.metadata = metadata
-                        self.doc_id = doc_id
-                    
-                    def get_content(self):
-                        return self.content
-                
-                doc_obj = DocumentForStorage(doc['content'], doc['metadata'], doc_id)
-                documents_with_embeddings.append((doc_obj, embedding))
+                documents.append(DocumentForStorage(doc['content'], doc['metadata'], doc_id))
                 
                 # Prepare for MongoDB (document storage)
                 documents_for_mongodb.append({
@@ -155,13 +153,18 @@ async def main():
                     'metadata': doc['metadata']
                 })
             
+            # Embed the content (contextualized or original) in concurrent batches;
+            # document vectors skip the query embedding cache
+            documents_with_embeddings = await embedding_service.get_embeddings_async(documents)
+            
             # Store documents in both databases
             if documents_with_embeddings:
-                # Store in Qdrant (vectors)
-                vector_store.add_documents(documents_with_embeddings)
-                
-                # Store in MongoDB (documents for keyword search)
-                document_store.add_documents(documents_for_mongodb)
+                # The stores are independent, so write Qdrant (vectors) and
+                # MongoDB (documents for keyword search) concurrently
+                await asyncio.gather(
+                    vector_store.add_documents_async(documents_with_embeddings),
+                    document_store.add_documents_async(documents_for_mongodb)
+                )
                 
                 logger.info(f"Stored {len(documents_with_embeddings)} documents in vector database")
                 logger.info(f"Stored {len(documents_for_mongodb)} documents in MongoDB")
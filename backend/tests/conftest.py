@@ -12,7 +12,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from app.core.config.settings import get_settings
+from app.core.config.settings import get_settings, reset_settings
 from app.core.agent import GeotechAgent
 from tests.fixtures.test_queries import TestQueryDatasets
 
@@ -56,6 +56,8 @@ def setup_test_environment():
     for key, value in test_env_vars.items():
         if key not in os.environ:
             os.environ[key] = value
+    # Settings are cached on first use (module imports already triggered it)
+    reset_settings()
     
     yield
     
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the agent answer cache
+"""
+
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.cache.answer_cache import AnswerCache
+from app.api.schema.response import AskResponse
+
+
+def make_response(answer: str) -> AskResponse:
+    return AskResponse(answer=answer, citations=[], trace_id="trace")
+
+
+@pytest.mark.unit
+class TestAnswerCache:
+    """Test exact-match answer caching"""
+    
+    def test_key_normalizes_case_and_whitespace(self):
+        """Questions differing only in case/whitespace share a key"""
+        key_a = AnswerCache.make_key("What is CPT?", "model")
+        key_b = AnswerCache.make_key("  what is   cpt? ", "model")
+        assert key_a == key_b
+    
+    def test_key_depends_on_namespace(self):
+        """Different models never share cached answers"""
+        assert AnswerCache.make_key("What is CPT?", "model-a") != AnswerCache.make_key("What is CPT?", "model-b")
+    
+    def test_get_and_set(self):
+        """Stored responses are returned and counted as hits"""
+        cache = AnswerCache()
+        cache.set("key", make_response("answer"))
+        
+        assert cache.get("key").answer == "answer"
+        assert cache.get("missing") is None
+        assert cache.hits == 1
+        assert cache.misses == 1
+    
+    def test_lru_eviction(self):
+        """Least recently used entries are evicted beyond max_size"""
+        cache = AnswerCache(max_size=2)
+        cache.set("a", make_response("a"))
+        cache.set("b", make_response("b"))
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", make_response("c"))
+        
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+    
+    def test_ttl_expiry(self):
+        """Entries expire after ttl_seconds"""
+        cache = AnswerCache(ttl_seconds=10)
+        with patch("app.core.cache.answer_cache.time.monotonic", return_value=100.0):
+            cache.set("key", make_response("answer"))
+        with patch("app.core.cache.answer_cache.time.monotonic", return_value=105.0):
+            assert cache.get("key") is not None
+        with patch("app.core.cache.answer_cache.time.monotonic", return_value=111.0):
+            assert cache.get("key") is None
+        assert len(cache) == 0
+    
+    def test_clear(self):
+        """clear() drops every entry"""
+        cache = AnswerCache()
+        cache.set("key", make_response("answer"))
+        cache.clear()
+        assert len(cache) == 0
+    
+    def test_semantic_hit_above_threshold(self):
+        """A close enough question embedding returns the stored answer"""
+        cache = AnswerCache(similarity_threshold=0.95)
+        cache.set("key", make_response("answer"), embedding=[1.0, 0.0, 0.0])
+        
+        assert cache.get_similar([0.99, 0.05, 0.0]).answer == "answer"
+        assert cache.get_similar([0.0, 1.0, 0.0]) is None
+        assert cache.semantic_hits == 1
+    
+    def test_semantic_tier_only_indexes_embedded_entries(self):
+        """Entries stored without an embedding are exact-match only"""
+        cache = AnswerCache()
+        cache.set("key", make_response("answer"))
+        assert cache.get_similar([1.0, 0.0]) is None
+    
+    def test_semantic_entries_follow_eviction(self):
+        """Evicted or capacity-limited entries stop matching similar questions"""
+        cache = AnswerCache(max_size=1, semantic_max_size=1)
+        cache.set("a", make_response("a"), embedding=[1.0, 0.0])
+        cache.set("b", make_response("b"), embedding=[0.0, 1.0])
+        
+        assert cache.get_similar([1.0, 0.0]) is None
+        assert cache.get_similar([0.0, 1.0]).answer == "b"
+    
+    def test_semantic_hit_refreshes_recency(self):
+        """A semantic hit keeps its entry in the semantic tier over older unused ones"""
+        cache = AnswerCache(semantic_max_size=2)
+        cache.set("a", make_response("a"), embedding=[1.0, 0.0, 0.0])
+        cache.set("b", make_response("b"), embedding=[0.0, 1.0, 0.0])
+        cache.get_similar([1.0, 0.0, 0.0])  # "b" is now least recently used
+        cache.set("c", make_response("c"), embedding=[0.0, 0.0, 1.0])
+        
+        assert cache.get_similar([0.0, 1.0, 0.0]) is None
+        assert cache.get_similar([1.0, 0.0, 0.0]).answer == "a"
+    
+    def test_semantic_ignores_invalid_embeddings(self):
+        """Malformed or mismatched embeddings are treated as misses"""
+        cache = AnswerCache()
+        cache.set("key", make_response("answer"), embedding=[1.0, 0.0])
+        
+        assert cache.get_similar([0.0, 0.0]) is None
+        assert cache.get_similar([1.0, 0.0, 0.0]) is None
+        assert cache.get_similar(object()) is None
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Unit tests for agent plan validation
+"""
+
+import sys
+import pytest
+from pathlib import Path
+from pydantic import ValidationError
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.agent import PlanModel, PromptTemplate, _parse_plan
+
+
+@pytest.mark.unit
+class TestPlanModel:
+    """Test planning output validation"""
+
+    def test_valid_retrieve_plan(self):
+        """Retrieve plans keep their search query and drop unset fields"""
+        plan = PlanModel.model_validate_json(
+            '{"action": "retrieve", "reasoning": "CPT question", "search_query": "CPT correlations"}'
+        ).model_dump(exclude_none=True)
+        assert plan == {"action": "retrieve", "reasoning": "CPT question", "search_query": "CPT correlations"}
+
+    def test_calculation_plan_parameters(self):
+        """Tool parameters are passed through unchanged"""
+        plan = PlanModel.model_validate_json(
+            '{"action": "calculate_settlement", "reasoning": "r", "tool_parameters": {"load": 1000, "young_modulus": 50000}}'
+        )
+        assert plan.tool_parameters == {"load": 1000, "young_modulus": 50000}
+
+    def test_unknown_action_rejected(self):
+        """Actions outside the allowed set fail validation"""
+        with pytest.raises(ValidationError):
+            PlanModel.model_validate_json('{"action": "guess", "reasoning": "r"}')
+
+    def test_missing_reasoning_rejected(self):
+        """Reasoning is required"""
+        with pytest.raises(ValidationError):
+            PlanModel.model_validate_json('{"action": "retrieve"}')
+
+    def test_malformed_json_rejected(self):
+        """Non-JSON content fails validation"""
+        with pytest.raises(ValidationError):
+            PlanModel.model_validate_json('not json')
+
+
+@pytest.mark.unit
+class TestParsePlan:
+    """Test extraction of the plan from the raw LLM reply"""
+
+    def test_plain_json(self):
+        """Bare JSON replies are parsed directly"""
+        assert _parse_plan('{"action": "out_of_scope", "reasoning": "r"}')["action"] == "out_of_scope"
+
+    def test_code_fence(self):
+        """Markdown code fences are unwrapped"""
+        content = '```json\n{"action": "retrieve", "reasoning": "r"}\n```'
+        assert _parse_plan(content) == {"action": "retrieve", "reasoning": "r"}
+
+    def test_surrounding_commentary(self):
+        """Prose around the JSON object is ignored"""
+        content = 'Here is the plan:\n{"action": "retrieve", "reasoning": "r"}\nLet me know if you need more.'
+        assert _parse_plan(content)["action"] == "retrieve"
+
+    def test_invalid_plan_still_rejected(self):
+        """A JSON object that fails validation is not rescued by extraction"""
+        with pytest.raises(ValidationError):
+            _parse_plan('{"action": "guess", "reasoning": "r"}')
+        with pytest.raises(ValidationError):
+            _parse_plan('No plan here')
+
+
+@pytest.mark.unit
+class TestPromptTemplate:
+    """Test pre-parsed prompt rendering"""
+
+    def test_matches_str_format(self):
+        """Rendering is identical to str.format, including escaped braces"""
+        template = 'Question: {question}\nReturn {{"action": "..."}} for {question}'
+        assert PromptTemplate(template).render(question="q") == template.format(question="q")
+
+    def test_fields(self):
+        """Field names are collected once"""
+        assert PromptTemplate("{a} and {b} and {a}").fields == frozenset({"a", "b"})
+
+    def test_missing_value_raises(self):
+        """Missing values fail like str.format"""
+        with pytest.raises(KeyError):
+            PromptTemplate("{question}").render()
+
+    def test_format_spec_rejected(self):
+        """Format specs are refused rather than silently ignored"""
+        with pytest.raises(ValueError):
+            PromptTemplate("{value:.2f}")
@@ -30,6 +30,7 @@ class TestRAGService:
         settings.GOOGLE_GENAI_API_KEY = "test-gemini-key"
         settings.QDRANT_HOST = "localhost"
         settings.QDRANT_PORT = 6333
+        settings.QDRANT_GRPC_PORT = 6334
         settings.QDRANT_COLLECTION_NAME = "test_collection"
         settings.MONGODB_HOST = "localhost"
         settings.MONGODB_PORT = 27017
@@ -157,6 +158,7 @@ class TestRAGServiceInitialization(TestRAGService):
             mock_qdrant.assert_called_once_with(
                 host="localhost",
                 port=6333,
+                grpc_port=6334,
                 collection_name="test_collection"
             )
             mock_mongodb.assert_called_once_with(
@@ -184,6 +186,7 @@ class TestRAGServiceInitialization(TestRAGService):
             mock_qdrant.assert_called_once_with(
                 host="custom-host",
                 port=9999,
+                grpc_port=6334,
                 collection_name="test_collection"
             )
 